@@ -0,0 +1,363 @@
+"""
+벤치마크용 로컬 모의 서버 (JSON-RPC / Etherscan V2 / CoinGecko / DexScreener)
+
+실제 네트워크 없이 조회 파이프라인 전체를 돌릴 수 있도록 결정적인 응답을 만들고,
+서버마다 지연시간/에러/429를 설정한 비율로 주입. 서버별 HTTP 요청 수와 호출 수를 집계
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from eth_abi import encode as abi_encode, decode as abi_decode
+
+MULTICALL3_ADDRESS = "0xca11bde05977b3631167028862be2a173976ca11"
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# ERC20 / Multicall3 함수 셀렉터
+AGGREGATE3_SELECTOR = "82ad56cb"
+BALANCE_OF_SELECTOR = "70a08231"
+NAME_SELECTOR = "06fdde03"
+SYMBOL_SELECTOR = "95d89b41"
+DECIMALS_SELECTOR = "313ce567"
+
+# DexScreener chainId 이름
+DEXSCREENER_CHAINS = ["ethereum", "bsc", "arbitrum", "optimism", "base", "avalanche", "polygon"]
+
+def stable_int(*parts):
+    """입력값으로 항상 같은 정수를 만듦 (잔고/블록 등 결정적인 모의 데이터용)"""
+    digest = hashlib.sha256("|".join(str(p).lower() for p in parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+class FaultProfile:
+    """응답 지연과 에러/429 주입 비율"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """이번 요청의 응답 지연 (초)"""
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def fault(self):
+        """이번 요청에 주입할 장애 ("rate_limit", "error" 또는 None)"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limit"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return None
+
+class MockChain:
+    """체인 하나의 모의 상태 (블록 높이, 토큰 메타데이터, 잔고, Transfer 로그)"""
+
+    def __init__(self, chain, chain_id, start_block=20_000_000, block_time=2.0, token_decimals=18):
+        self.chain = chain
+        self.chain_id = chain_id
+        self.start_block = start_block
+        self.block_time = block_time
+        self.token_decimals = token_decimals
+        self._started = time.time()
+
+    def block_number(self):
+        return self.start_block + int((time.time() - self._started) / self.block_time)
+
+    def block_timestamp(self, block):
+        return int(self._started + (block - self.start_block) * self.block_time)
+
+    def balance(self, token, wallet, block=None):
+        """지갑 잔고 (원시 정수, 블록이 바뀌면 조금씩 변함)"""
+        block = block if block is not None else self.block_number()
+        base = stable_int(self.chain, token, wallet) % 5_000_000
+        drift = stable_int(self.chain, token, wallet, block // 10) % 10_000
+        return (base + drift) * 10 ** self.token_decimals
+
+    def call(self, to, data, block=None):
+        """eth_call 하나의 반환값 (bytes), 모르는 함수면 None"""
+        selector = data[:4].hex()
+        if selector == BALANCE_OF_SELECTOR:
+            wallet = "0x" + data[4:36][-20:].hex()
+            return abi_encode(["uint256"], [self.balance(to, wallet, block)])
+        if selector == NAME_SELECTOR:
+            return abi_encode(["string"], [f"Mock Token {to[2:8]}"])
+        if selector == SYMBOL_SELECTOR:
+            return abi_encode(["string"], [f"M{to[2:6].upper()}"])
+        if selector == DECIMALS_SELECTOR:
+            return abi_encode(["uint8"], [self.token_decimals])
+        return None
+
+    def multicall(self, data, block=None):
+        """Multicall3 aggregate3 calldata를 풀어서 호출별 결과를 다시 인코딩"""
+        calls = abi_decode(["(address,bool,bytes)[]"], data[4:])[0]
+        results = []
+        for target, _allow_failure, call_data in calls:
+            result = self.call(target.lower(), call_data, block)
+            results.append((result is not None, result or b""))
+        return abi_encode(["(bool,bytes)[]"], [results]), len(calls)
+
+    def transfer_logs(self, token, senders, from_block, to_block):
+        """지갑별 최근 출금 Transfer 로그 (범위 안에 있는 것만)"""
+        logs = []
+        span = max(1, to_block - from_block + 1)
+        for sender in senders:
+            # 지갑마다 정해진 주기로 출금이 발생한다고 가정
+            block = to_block - stable_int(self.chain, token, sender, to_block // 500) % (span * 2)
+            if block < from_block:
+                continue
+            receiver = "0x" + format(stable_int(sender, block), "040x")[-40:]
+            logs.append({
+                "address": token,
+                "topics": [TRANSFER_TOPIC, sender, "0x" + "0" * 24 + receiver[2:]],
+                "data": hex(self.balance(token, sender[-40:], block) // 100),
+                "blockNumber": hex(block),
+                "logIndex": hex(stable_int(sender, block) % 50),
+                "transactionHash": "0x" + format(stable_int(token, sender, block), "064x")
+            })
+        return logs
+
+    def token_transfers(self, token, wallet, start_block=0, count=30):
+        """Etherscan tokentx 응답 형식의 최근 거래 (최신순, 입출금 섞임)"""
+        latest = self.block_number()
+        txs = []
+        for i in range(count):
+            block = latest - i * 7 - stable_int(wallet, i) % 5
+            if block < start_block:
+                break
+            counterparty = "0x" + format(stable_int(wallet, token, i), "040x")[-40:]
+            outgoing = stable_int(self.chain, wallet, block) % 3 == 0
+            txs.append({
+                "blockNumber": str(block),
+                "timeStamp": str(self.block_timestamp(block)),
+                "hash": "0x" + format(stable_int(wallet, block, i), "064x"),
+                "from": wallet if outgoing else counterparty,
+                "to": counterparty if outgoing else wallet,
+                "value": str(self.balance(token, wallet, block) // 50),
+                "tokenDecimal": str(self.token_decimals)
+            })
+        return txs
+
+class MockServer:
+    """요청 처리 함수를 별도 스레드의 HTTP 서버로 띄우고 요청 수를 집계"""
+
+    def __init__(self, name, faults=None):
+        self.name = name
+        self.faults = faults or FaultProfile()
+        self.stats = {"requests": 0, "calls": 0, "errors": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, body):
+                server.count("requests")
+                time.sleep(server.faults.delay())
+                fault = server.faults.fault()
+                if fault == "rate_limit":
+                    server.count("rate_limited")
+                    status, payload = 429, {"error": "Too Many Requests"}
+                elif fault == "error":
+                    server.count("errors")
+                    status, payload = 503, {"error": "Service Unavailable"}
+                else:
+                    parsed = urlparse(self.path)
+                    status, payload = server.handle(self.command, parsed.path, parse_qs(parsed.query), body)
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond(None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self._respond(json.loads(self.rfile.read(length) or b"null"))
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"mock-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def handle(self, method, path, query, body):
+        """
+        요청 처리 (하위 클래스에서 구현)
+
+        Returns:
+            tuple: (HTTP 상태 코드, JSON으로 보낼 값)
+        """
+        return 404, {"error": "not found"}
+
+class MockRpcServer(MockServer):
+    """JSON-RPC 엔드포인트 (단일/배치, eth_call/Multicall3, eth_getLogs 범위 제한 포함)"""
+
+    def __init__(self, name, chain, faults=None, max_batch_size=100, max_log_range=5000):
+        super().__init__(name, faults)
+        self.chain = chain
+        self.max_batch_size = max_batch_size
+        self.max_log_range = max_log_range
+
+    def handle(self, method, path, query, body):
+        if isinstance(body, list):
+            if len(body) > self.max_batch_size:
+                return 200, {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}}
+            return 200, [self.dispatch(item) for item in body]
+        return 200, self.dispatch(body)
+
+    def dispatch(self, request):
+        self.count("calls")
+        rpc_method = request.get("method")
+        params = request.get("params") or []
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            response["result"] = self.call_method(rpc_method, params)
+        except ValueError as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        except KeyError:
+            response["error"] = {"code": -32601, "message": f"method not found: {rpc_method}"}
+        return response
+
+    def _block(self, tag):
+        if tag in (None, "latest", "pending", "safe", "finalized"):
+            return self.chain.block_number()
+        return int(tag, 16)
+
+    def call_method(self, rpc_method, params):
+        if rpc_method == "eth_blockNumber":
+            return hex(self.chain.block_number())
+        if rpc_method == "eth_chainId":
+            return hex(self.chain.chain_id)
+        if rpc_method == "eth_getBlockByNumber":
+            block = self._block(params[0])
+            return {"number": hex(block), "timestamp": hex(self.chain.block_timestamp(block))}
+        if rpc_method == "eth_call":
+            call, tag = params[0], params[1] if len(params) > 1 else "latest"
+            block = self._block(tag)
+            if block > self.chain.block_number():
+                raise ValueError("header not found")
+            to = call["to"].lower()
+            data = bytes.fromhex((call.get("data") or call.get("input") or "0x")[2:])
+            if to == MULTICALL3_ADDRESS and data[:4].hex() == AGGREGATE3_SELECTOR:
+                result, inner_calls = self.chain.multicall(data, block)
+                self.count("calls", inner_calls)
+                return "0x" + result.hex()
+            result = self.chain.call(to, data, block)
+            return "0x" + result.hex() if result is not None else "0x"
+        if rpc_method == "eth_getLogs":
+            log_filter = params[0]
+            from_block, to_block = self._block(log_filter["fromBlock"]), self._block(log_filter["toBlock"])
+            if to_block - from_block + 1 > self.max_log_range:
+                raise ValueError(f"block range too large, max is {self.max_log_range}")
+            topics = log_filter.get("topics") or []
+            senders = topics[1] if len(topics) > 1 and isinstance(topics[1], list) else []
+            return self.chain.transfer_logs(log_filter["address"].lower(), senders, from_block, to_block)
+        raise KeyError(rpc_method)
+
+class MockExplorerServer(MockServer):
+    """Etherscan V2 / Routescan 호환 tokentx API"""
+
+    def __init__(self, name, chains, faults=None):
+        super().__init__(name, faults)
+        self.chains_by_id = {chain.chain_id: chain for chain in chains}
+
+    def handle(self, method, path, query, body):
+        def arg(key, default=None):
+            return query.get(key, [default])[0]
+
+        self.count("calls")
+        chain = self.chains_by_id.get(int(arg("chainid", 43114)))
+        if chain is None or arg("action") != "tokentx":
+            return 200, {"status": "0", "message": "NOTOK", "result": "Invalid chain or action"}
+
+        txs = chain.token_transfers(
+            arg("contractaddress", "").lower(),
+            arg("address", "").lower(),
+            start_block=int(arg("startblock", 0)),
+            count=int(arg("offset", 30))
+        )
+        if not txs:
+            return 200, {"status": "0", "message": "No transactions found", "result": []}
+        return 200, {"status": "1", "message": "OK", "result": txs}
+
+class MockCoinGeckoServer(MockServer):
+    """CoinGecko 컨트랙트 상세 / simple token_price API"""
+
+    def handle(self, method, path, query, body):
+        self.count("calls")
+        if "/contract/" in path:
+            price = 1 + stable_int(path) % 1000 / 1000
+            return 200, {"market_data": {
+                "current_price": {"usd": price},
+                "market_cap": {"usd": price * 1e9},
+                "fully_diluted_valuation": {"usd": price * 1.2e9},
+                "total_volume": {"usd": price * 5e7},
+                "price_change_percentage_24h": stable_int(path, "change") % 2000 / 100 - 10,
+                "circulating_supply": 1e9,
+                "total_supply": 1.2e9
+            }}
+        if "/simple/token_price/" in path:
+            addresses = query.get("contract_addresses", [""])[0].split(",")
+            return 200, {address: {"usd": 1 + stable_int(address) % 1000 / 1000} for address in addresses if address}
+        return 404, {"error": "not found"}
+
+class MockDexScreenerServer(MockServer):
+    """DexScreener 토큰 페어 API"""
+
+    def handle(self, method, path, query, body):
+        self.count("calls")
+        if not path.startswith("/latest/dex/tokens/"):
+            return 404, {"error": "not found"}
+        token = path.rsplit("/", 1)[-1].lower()
+        pairs = []
+        for chain_name in DEXSCREENER_CHAINS:
+            for dex in ("uniswap", "pancakeswap"):
+                pairs.append({
+                    "chainId": chain_name,
+                    "dexId": dex,
+                    "pairAddress": "0x" + format(stable_int(token, chain_name, dex), "040x")[-40:],
+                    "baseToken": {"address": token, "symbol": "MOCK"},
+                    "quoteToken": {"symbol": "WETH"},
+                    "liquidity": {"usd": stable_int(token, chain_name, dex, "liq") % 10_000_000},
+                    "priceUsd": "1.0",
+                    "volume": {"h24": stable_int(token, chain_name, dex, "vol") % 1_000_000}
+                })
+        return 200, {"pairs": pairs}
@@ -0,0 +1,202 @@
+"""
+오프라인 벤치마크: 로컬 모의 RPC/Explorer/시장 데이터 서버를 띄우고 조회 엔진 전체를 반복 실행
+
+실제 네트워크 없이 wallets.json의 지갑 목록으로 fetch_dashboard_data / fetch_cross_chain_data를 돌리고,
+지연시간/에러율/429 비율을 바꿔가며 단계별 소요시간, 서버별 요청 수, 처리량을 비교
+
+    python bench/run_bench.py --chains ETH BSC --iterations 5 --latency 0.05 --error-rate 0.02
+    python bench/run_bench.py --mode cross --withdrawals logs --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hotwallet_core as core
+from mock_servers import (
+    FaultProfile, MockChain, MockRpcServer, MockExplorerServer, MockCoinGeckoServer, MockDexScreenerServer
+)
+
+AVAX_CHAIN_ID = 43114
+# 모의 토큰 기본 주소 (결정적인 잔고를 만들기 위한 값일 뿐, 실제 컨트랙트와 무관)
+DEFAULT_TOKEN = "0x00000000000000000000000000000000000b3c41"
+
+def start_mock_servers(chains, args):
+    """
+    체인별 RPC 서버(엔드포인트 N개)와 Explorer/시장 데이터 서버를 띄우고 core의 URL을 모의 서버로 교체
+
+    Returns:
+        list: 시작된 MockServer 목록
+    """
+    def faults(seed, latency=args.latency):
+        return FaultProfile(latency=latency, jitter=args.jitter, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, seed=seed)
+
+    servers = []
+    mock_chains = {}
+    for chain in chains:
+        chain_id = AVAX_CHAIN_ID if chain == "AVAX" else core.CHAIN_IDS[chain]
+        mock_chains[chain] = MockChain(chain, chain_id)
+        rpc_servers = []
+        for i in range(args.endpoints):
+            # --slow-endpoint: 첫 번째 엔드포인트만 느리게 (헤지/엔드포인트 선택 효과 확인용)
+            latency = args.latency + args.slow_endpoint if i == 0 else args.latency
+            rpc_servers.append(MockRpcServer(f"rpc-{chain}-{i}", mock_chains[chain], faults(f"{chain}-{i}", latency)).start())
+        core.RPC_URLS[chain] = [server.url for server in rpc_servers]
+        servers.extend(rpc_servers)
+
+    explorer = MockExplorerServer("etherscan", [c for name, c in mock_chains.items() if name != "AVAX"], faults("etherscan")).start()
+    routescan = MockExplorerServer("routescan", [c for name, c in mock_chains.items() if name == "AVAX"], faults("routescan")).start()
+    coingecko = MockCoinGeckoServer("coingecko", faults("coingecko")).start()
+    dexscreener = MockDexScreenerServer("dexscreener", faults("dexscreener")).start()
+    servers.extend([explorer, routescan, coingecko, dexscreener])
+
+    core.ETHERSCAN_V2_API = f"{explorer.url}/v2/api"
+    core.AVAX_API_URL = f"{routescan.url}/api"
+    core.COINGECKO_API = f"{coingecko.url}/api/v3"
+    core.DEXSCREENER_API = dexscreener.url
+    # 1inch 가격 폴백은 모의 서버가 없으므로 404로 빠르게 실패시킴
+    core.ONEINCH_API = dexscreener.url
+
+    # Explorer 속도 제한은 운영 기본값(Etherscan 5 calls/sec)을 그대로 적용 (--explorer-rate로 변경)
+    core.configure(
+        explorer_api_keys={chain: "bench" for chain in chains},
+        explorer_rate_limits={
+            core.url_host(explorer.url): args.explorer_rate,
+            core.url_host(routescan.url): args.explorer_rate
+        }
+    )
+    return servers
+
+def run_iteration(chains, token, args):
+    """한 번의 새로고침 (체인별 결과, 소요시간)"""
+    withdrawal_source = "Explorer API" if args.withdrawals == "explorer" else "RPC 로그 스캔"
+    started = time.perf_counter()
+    if args.mode == "cross":
+        results = asyncio.run(core.fetch_cross_chain_data({chain: token for chain in chains}, hedge=args.hedge,
+                                                          max_workers=args.workers))
+    else:
+        results = {}
+        for chain in chains:
+            try:
+                results[chain] = asyncio.run(core.fetch_dashboard_data(
+                    chain, token, core.get_chain_info()[chain]["wallets"], include_dex=args.dex,
+                    withdrawal_source=withdrawal_source, hedge=args.hedge, max_workers=args.workers
+                ))
+            except Exception as e:
+                results[chain] = {"error": str(e)[:100]}
+    return results, time.perf_counter() - started
+
+def summarize_phases(iterations):
+    """단계별 소요시간 평균 (첫 반복=콜드 캐시, 나머지=웜 캐시)"""
+    def average(runs):
+        phases = {}
+        for results in runs:
+            for data in results.values():
+                for phase, seconds in data.get("timings", {}).items():
+                    phases.setdefault(phase, []).append(seconds)
+        return {phase: round(statistics.mean(values), 4) for phase, values in sorted(phases.items())}
+
+    return {"cold": average(iterations[:1]), "warm": average(iterations[1:])}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 모의 서버로 조회 엔진 벤치마크 (네트워크 불필요)")
+    parser.add_argument("--chains", nargs="+", default=["ETH", "BSC"], help="벤치마크할 체인 (wallets.json 기준)")
+    parser.add_argument("--token", default=DEFAULT_TOKEN, help="모의 토큰 주소")
+    parser.add_argument("--iterations", type=int, default=3, help="반복 횟수 (첫 번째는 콜드 캐시)")
+    parser.add_argument("--mode", choices=["single", "cross"], default="single",
+                        help="single: 체인별 fetch_dashboard_data, cross: fetch_cross_chain_data")
+    parser.add_argument("--withdrawals", choices=["explorer", "logs"], default="explorer", help="최근출금 조회 방식 (single 모드)")
+    parser.add_argument("--dex", action="store_true", help="DEX 유동성 풀 포함")
+    parser.add_argument("--no-hedge", dest="hedge", action="store_false", help="RPC 헤지 요청 사용 안 함")
+    parser.add_argument("--workers", type=int, default=4, help="Explorer 동시 요청 수")
+    parser.add_argument("--endpoints", type=int, default=3, help="체인별 모의 RPC 엔드포인트 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="모의 서버 기본 응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="응답 지연 변동폭 (초)")
+    parser.add_argument("--slow-endpoint", type=float, default=0.0, help="체인별 첫 RPC 엔드포인트에 더할 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--explorer-rate", type=float, default=core.EXPLORER_DEFAULT_RATE_LIMITS["api.etherscan.io"],
+                        help="모의 Explorer에 적용할 calls/sec 제한")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    unknown = [chain for chain in args.chains if chain not in core.get_chain_info()]
+    if unknown:
+        parser.error(f"wallets.json에 없는 체인: {', '.join(unknown)}")
+
+    # 토큰 메타데이터/잔고 히스토리가 실제 캐시 디렉터리에 섞이지 않도록 임시 디렉터리 사용
+    core.CACHE_DIR = tempfile.mkdtemp(prefix="hotwallet-bench-")
+    servers = start_mock_servers(args.chains, args)
+    wallet_count = sum(len(core.get_chain_info()[chain]["wallets"]) for chain in args.chains)
+
+    iterations, rows = [], []
+    try:
+        for i in range(args.iterations):
+            before = {server.name: server.snapshot() for server in servers}
+            results, seconds = run_iteration(args.chains, args.token, args)
+            after = {server.name: server.snapshot() for server in servers}
+            iterations.append(results)
+
+            traffic = {
+                name: {key: after[name][key] - before[name][key] for key in after[name]}
+                for name in after
+            }
+            requests_total = sum(t["requests"] for t in traffic.values())
+            rows.append({
+                "iteration": i + 1,
+                "seconds": round(seconds, 4),
+                "errors": {chain: data["error"] for chain, data in results.items() if "error" in data},
+                "wallets_per_sec": round(wallet_count / seconds, 1) if seconds > 0 else None,
+                "requests": requests_total,
+                "requests_per_sec": round(requests_total / seconds, 1) if seconds > 0 else None,
+                "servers": {name: t for name, t in traffic.items() if t["requests"]}
+            })
+    finally:
+        for server in servers:
+            server.stop()
+
+    warm = [row["seconds"] for row in rows[1:]]
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "json"},
+        "wallets": wallet_count,
+        "import_seconds": round(core.IMPORT_SECONDS, 4),
+        "iterations": rows,
+        "phases": summarize_phases(iterations),
+        "cold_seconds": rows[0]["seconds"] if rows else None,
+        "warm_seconds_mean": round(statistics.mean(warm), 4) if warm else None,
+        "balance_cache": {"hits": core.get_balance_cache().hits, "misses": core.get_balance_cache().misses}
+    }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"체인 {', '.join(args.chains)} / 지갑 {wallet_count}개 / 모드 {args.mode} / 반복 {args.iterations}회")
+    for row in rows:
+        errors = f"  에러: {row['errors']}" if row["errors"] else ""
+        print(f"  #{row['iteration']}: {row['seconds']:.3f}초, {row['wallets_per_sec']} 지갑/초, "
+              f"요청 {row['requests']}개 ({row['requests_per_sec']}/초){errors}")
+    for label, phases in report["phases"].items():
+        if phases:
+            print(f"  단계별 평균 ({label}): " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in phases.items()))
+    print("  서버별 요청 (전체 반복 합계):")
+    totals = {}
+    for row in rows:
+        for name, traffic in row["servers"].items():
+            for key, value in traffic.items():
+                totals.setdefault(name, {}).setdefault(key, 0)
+                totals[name][key] += value
+    for name, traffic in totals.items():
+        print(f"    {name}: 요청 {traffic['requests']}, 호출 {traffic['calls']}, "
+              f"503 {traffic['errors']}, 429 {traffic['rate_limited']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3473 @@
+"""
+핫월렛 트래커 조회 코어 (Streamlit 없이 import 가능)
+
+잔고/출금/시장 데이터 조회, 캐시, 백그라운드 수집기를 담고 있으며 대시보드(hotwallet_tracker.py)와
+CLI(python hotwallet_core.py --chain ETH --token 0x...)에서 함께 사용.
+web3/pandas/numpy/requests는 처음 사용할 때 import해서 import 시간을 짧게 유지
+"""
+import time
+
+# import 소요시간 측정용 (CLI 출력에 포함)
+_IMPORT_STARTED = time.perf_counter()
+
+import importlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import deque, OrderedDict
+import functools
+import threading
+import os
+import sys
+import sqlite3
+import asyncio
+import re
+import json
+
+class LazyImport:
+    """처음 사용할 때 import되는 모듈/속성 프록시 (무거운 의존성의 import 비용을 실제 사용 시점으로 미룸)"""
+
+    def __init__(self, module, attr=None):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._attr) if self._attr else target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+pd = LazyImport("pandas")
+np = LazyImport("numpy")
+requests = LazyImport("requests")
+Web3 = LazyImport("web3", "Web3")
+abi_encode = LazyImport("eth_abi", "encode")
+abi_decode = LazyImport("eth_abi", "decode")
+
+def shared_resource(func):
+    """
+    프로세스 전역 공유 객체 (인자 조합별로 한 번만 생성)
+
+    대시보드 리런/세션, CLI, 수집기 스레드가 모두 같은 인스턴스를 사용.
+    키워드 인자도 키에 포함 (위치 인자와 키워드 인자로 같은 값을 넘기면 서로 다른 키로 취급)
+    """
+    lock = threading.Lock()
+    instances = {}
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            if key not in instances:
+                instances[key] = func(*args, **kwargs)
+            return instances[key]
+
+    return wrapper
+
+# ============================================================
+# Explorer API 키 설정 (환경변수 또는 configure()로 주입)
+# ============================================================
+# 환경변수: EXPLORER_API_KEY_ETH, EXPLORER_API_KEY_BSC, ... (체인 이름 대문자)
+# 대시보드는 Streamlit Secrets의 [explorer_api_keys] / [explorer_rate_limits]를 configure()로 넘겨줌
+_settings = {
+    "explorer_api_keys": {},
+    "explorer_rate_limits": {}
+}
+
+def configure(explorer_api_keys=None, explorer_rate_limits=None):
+    """
+    API 키/속도 제한 설정 주입 (None인 항목은 기존 값 유지)
+
+    Args:
+        explorer_api_keys: {체인: API 키}
+        explorer_rate_limits: {Explorer 호스트: calls/sec}
+    """
+    if explorer_api_keys is not None:
+        _settings["explorer_api_keys"] = dict(explorer_api_keys)
+    if explorer_rate_limits is not None:
+        _settings["explorer_rate_limits"] = dict(explorer_rate_limits)
+
+def get_explorer_api_key(chain):
+    """Explorer API 키 가져오기 (configure() 설정 → 환경변수 순서)"""
+    return _settings["explorer_api_keys"].get(chain) or os.environ.get(f"EXPLORER_API_KEY_{chain}", "")
+
+# Explorer API URL 매핑 (Etherscan API V2 사용)
+# V2는 단일 엔드포인트 + chainid 파라미터 방식
+ETHERSCAN_V2_API = "https://api.etherscan.io/v2/api"
+
+# 체인별 Chain ID (Etherscan V2용)
+CHAIN_IDS = {
+    "ETH": 1,
+    "BSC": 56,
+    "ARB": 42161,
+    "OP": 10,
+    "BASE": 8453,
+    "POL": 137
+}
+
+# AVAX는 별도 API 사용 (Routescan)
+AVAX_API_URL = "https://api.routescan.io/v2/network/mainnet/evm/43114/etherscan/api"
+
+# 시장 데이터 API (bench/에서 로컬 모의 서버로 바꿔 끼울 수 있도록 상수로 관리)
+COINGECKO_API = "https://api.coingecko.com/api/v3"
+ONEINCH_API = "https://api.1inch.io/v5.0"
+DEXSCREENER_API = "https://api.dexscreener.com"
+
+# RPC URL을 chain에 따라 넣어줍니다.
+RPC_URLS = {
+    "ETH": [
+        "https://eth.llamarpc.com",
+        "https://ethereum.publicnode.com",
+        "https://rpc.ankr.com/eth",
+        "https://eth-mainnet.public.blastapi.io",
+        "https://rpc.flashbots.net",
+        "https://eth.drpc.org",
+        "https://eth-mainnet.g.alchemy.com/v2/demo"
+    ],
+    "BSC": [
+        "https://rpc.ankr.com/bsc",
+        "https://bsc-dataseed.binance.org",
+        "https://bsc-dataseed1.binance.org",
+        "https://bsc-dataseed2.binance.org",
+        "https://bsc.publicnode.com"
+    ],
+    "ARB": [
+        "https://arb1.arbitrum.io/rpc",
+        "https://arbitrum.llamarpc.com",
+        "https://arbitrum-one.publicnode.com",
+        "https://rpc.ankr.com/arbitrum"
+    ],
+    "OP": [
+        "https://mainnet.optimism.io",
+        "https://optimism.llamarpc.com",
+        "https://optimism.publicnode.com",
+        "https://rpc.ankr.com/optimism"
+    ],
+    "BASE": [
+        "https://mainnet.base.org",
+        "https://base.llamarpc.com",
+        "https://base.publicnode.com",
+        "https://rpc.ankr.com/base"
+    ],
+    "AVAX": [
+        "https://api.avax.network/ext/bc/C/rpc",
+        "https://rpc.ankr.com/avalanche",
+        "https://avalanche.publicnode.com",
+        "https://avalanche-c-chain.publicnode.com"
+    ],
+    "POL": [
+        "https://polygon-rpc.com",
+        "https://polygon.llamarpc.com",
+        "https://polygon.publicnode.com",
+        "https://rpc.ankr.com/polygon"
+    ]
+}
+
+COINGECKO_CHAIN_MAP = {
+    "ETH": "ethereum",
+    "ARB": "arbitrum-one",
+    "BSC": "binance-smart-chain",
+    "BASE": "base",
+    "OP": "optimistic-ethereum",
+    "AVAX": "avalanche",
+    "POL": "polygon-pos"
+}
+
+# 크로스체인 합산 모드 프리셋 (체인별 브릿지 토큰 컨트랙트)
+CROSS_CHAIN_PRESETS = {
+    "USDT": {
+        "ETH": "0xdac17f958d2ee523a2206206994597c13d831ec7",
+        "BSC": "0x55d398326f99059ff775485246999027b3197955",
+        "ARB": "0xfd086bc7cd5c481dcc9c85ebe478a1c0b69fcbb9",
+        "OP": "0x94b008aa00579c1307b0ef2c499ad98a8ce58e58",
+        "AVAX": "0x9702230a8ea53601f5cd2dc00fdbc13d4df4a8c7",
+        "POL": "0xc2132d05d31c914a87c6611c10748aeb04b58e8f"
+    },
+    "USDC": {
+        "ETH": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48",
+        "BSC": "0x8ac76a51cc950d9822d68b83fe1ad97b32cd580d",
+        "ARB": "0xaf88d065e77c8cc2239327c5edb3a432268e5831",
+        "OP": "0x0b2c639c533813f4aa9d7837caf62653d097ff85",
+        "BASE": "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913",
+        "AVAX": "0xb97ef9ef8734c71904d8002f8b6bc66dd9c48a6e",
+        "POL": "0x3c499c542cef5e3811e1192ce70d8cc03d5c3359"
+    }
+}
+
+# 지갑 이름에서 거래소 이름 추출 ("바낸핫2" → "바낸", "코베7번핫" → "코베")
+WALLET_EXCHANGE_PATTERN = re.compile(r"^(.+?)(?=\s|\d|핫|콜드|withdraw|지갑|\(|$)")
+# 같은 거래소의 다른 표기
+EXCHANGE_ALIASES = {
+    "훠비": "후오비"
+}
+
+def wallet_exchange(wallet_name):
+    """지갑 이름에서 거래소 이름 추출 (크로스체인 합산용)"""
+    match = WALLET_EXCHANGE_PATTERN.match(wallet_name.strip())
+    exchange = match.group(1) if match else wallet_name
+    return EXCHANGE_ALIASES.get(exchange, exchange)
+
+# ============================================================
+# 지갑 레지스트리 (wallets.json에서 한 번 로드해서 인덱싱)
+# ============================================================
+# 체인별 explorer/rpc/지갑 목록 파일 (HOTWALLET_WALLETS_FILE 환경변수로 변경 가능)
+WALLETS_FILE = os.environ.get(
+    "HOTWALLET_WALLETS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "wallets.json")
+)
+
+class WalletRegistry:
+    """
+    체인별 지갑 목록 인덱스
+
+    주소는 로드할 때 한 번만 체크섬 형식으로 변환하고, 같은 체인에 같은 주소가 여러 이름으로 있으면
+    첫 이름 하나로 합쳐서 한 번만 조회되도록 함 (나머지 이름은 별칭으로 보관)
+    """
+
+    def __init__(self, data):
+        self.chains = {}
+        self.labels = {}
+        self.exchanges = {}
+        self.by_exchange = {}
+        self.by_label = {}
+
+        for chain, info in data.items():
+            wallets = {}
+            for name, address in info.get("wallets", {}).items():
+                try:
+                    checksum = Web3.to_checksum_address(address.strip().lower())
+                except ValueError:
+                    raise ValueError(f"{chain} 체인 '{name}' 지갑 주소가 올바르지 않습니다: {address}")
+
+                key = (chain, checksum)
+                self.by_label.setdefault(name, []).append(key)
+                if key in self.labels:
+                    self.labels[key].append(name)
+                    continue
+
+                exchange = wallet_exchange(name)
+                wallets[name] = checksum
+                self.labels[key] = [name]
+                self.exchanges[key] = exchange
+                self.by_exchange.setdefault(exchange, []).append(key)
+
+            self.chains[chain] = {**{k: v for k, v in info.items() if k != "wallets"}, "wallets": wallets}
+
+    def wallet_count(self):
+        """체인 내 중복을 제외한 전체 지갑 수"""
+        return len(self.labels)
+
+# 가장 최근에 로드한 레지스트리 하나만 보관 (파일을 고칠 때마다 이전 레지스트리가 쌓이지 않도록)
+_wallet_registry_lock = threading.Lock()
+_wallet_registry = {"key": None, "registry": None}
+
+def load_wallet_registry(path):
+    """지갑 목록 파일을 읽어서 인덱싱"""
+    with open(path, encoding="utf-8") as f:
+        return WalletRegistry(json.load(f))
+
+def get_wallet_registry(path=None):
+    """현재 지갑 레지스트리 (처음 사용할 때 로드하고, 파일이 바뀌면 mtime이 달라져서 다시 로드)"""
+    path = path or WALLETS_FILE
+    key = (path, os.path.getmtime(path))
+    with _wallet_registry_lock:
+        if _wallet_registry["key"] != key:
+            _wallet_registry["registry"] = load_wallet_registry(path)
+            _wallet_registry["key"] = key
+        return _wallet_registry["registry"]
+
+def get_chain_info():
+    """체인별 {"explorer", "rpc", "wallets": {지갑 이름: 체크섬 주소}}"""
+    return get_wallet_registry().chains
+
+def parse_chain_contracts(text):
+    """
+    "체인: 0x주소" 형식의 여러 줄 입력을 {체인: 컨트랙트 주소}로 변환 (알 수 없는 체인/잘못된 주소는 무시)
+    """
+    contracts = {}
+    for line in text.splitlines():
+        if ":" not in line:
+            continue
+        chain, contract = (part.strip() for part in line.split(":", 1))
+        chain = chain.upper()
+        if chain in get_chain_info() and contract.startswith("0x") and len(contract) == 42:
+            contracts[chain] = contract
+    return contracts
+
+# 조회에 성공한 토큰 정보 (체인, 컨트랙트)별 메모리 캐시 (thread-safe)
+token_info_lock = threading.Lock()
+token_info_cache = {}
+
+# ============================================================
+# 메트릭 (단계별 소요시간, 호스트별 지연/에러/재시도) - 디버깅 패널과 Prometheus 엔드포인트에서 사용
+# ============================================================
+# 히스토그램 버킷 상한 (초)
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 180)
+# 백분위 표시용으로 보관할 최근 샘플 수
+METRICS_SAMPLES = 200
+# Prometheus 엔드포인트 포트 (HOTWALLET_METRICS_PORT 환경변수, 없으면 띄우지 않음)
+METRICS_PORT = os.environ.get("HOTWALLET_METRICS_PORT")
+
+def prometheus_label(value):
+    """Prometheus 라벨 값 이스케이프"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class LatencyHistogram:
+    """누적 버킷 히스토그램 + 최근 샘플 (lock은 MetricsRegistry가 관리)"""
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=METRICS_SAMPLES)
+
+    def observe(self, seconds):
+        for i, upper in enumerate(self.buckets):
+            if seconds <= upper:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.samples.append(seconds)
+
+    def summary(self):
+        samples = list(self.samples)
+        return {
+            "횟수": self.count,
+            "평균": self.sum / self.count if self.count else 0.0,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "최대": max(samples, default=0.0)
+        }
+
+class MetricsRegistry:
+    """
+    조회 단계별 소요시간과 외부 호스트별 요청 지연/결과/재시도 횟수 집계 (thread-safe, 프로세스 전역)
+
+    단계: fetch_dashboard_data의 timings 키 (block=RPC 선택+스냅샷 블록, token_info, market, balances, withdrawals, dex, total)
+    호스트 요청: 모든 HTTP 요청이 거치는 TrackedHTTPAdapter에서 기록
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._hosts = {}
+        self._outcomes = {}
+        self._retries = {}
+
+    def observe_phase(self, chain, phase, seconds):
+        with self._lock:
+            histogram = self._phases.get((chain, phase))
+            if histogram is None:
+                histogram = self._phases[(chain, phase)] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def observe_request(self, host, seconds, outcome):
+        """
+        외부 요청 하나 기록
+
+        Args:
+            outcome: "ok", "error" (연결 실패/5xx), "rate_limited" (429)
+        """
+        with self._lock:
+            histogram = self._hosts.get(host)
+            if histogram is None:
+                histogram = self._hosts[host] = LatencyHistogram()
+            histogram.observe(seconds)
+            self._outcomes[(host, outcome)] = self._outcomes.get((host, outcome), 0) + 1
+
+    def count_retry(self, host, reason):
+        """
+        재시도 기록
+
+        Args:
+            reason: "failover" (다음 엔드포인트), "hedge", "rate_limit", "error", "batch_split", "log_range"
+        """
+        with self._lock:
+            self._retries[(host, reason)] = self._retries.get((host, reason), 0) + 1
+
+    def phase_summary(self, chain=None):
+        """{(체인, 단계): 요약} (chain을 주면 해당 체인만)"""
+        with self._lock:
+            return {
+                key: histogram.summary()
+                for key, histogram in sorted(self._phases.items())
+                if chain is None or key[0] == chain
+            }
+
+    def host_summary(self):
+        """{호스트: 지연 요약 + 결과별/재시도 횟수}"""
+        with self._lock:
+            summary = {}
+            for host, histogram in sorted(self._hosts.items()):
+                row = histogram.summary()
+                row["에러"] = self._outcomes.get((host, "error"), 0)
+                row["429"] = self._outcomes.get((host, "rate_limited"), 0)
+                row["재시도"] = sum(count for (h, _), count in self._retries.items() if h == host)
+                summary[host] = row
+            return summary
+
+    def render_prometheus(self):
+        """Prometheus text exposition 형식 (0.0.4)"""
+        def labels(**values):
+            return "{" + ",".join(f'{name}="{prometheus_label(value)}"' for name, value in values.items()) + "}"
+
+        def histogram_lines(name, histogram, **label_values):
+            for upper, count in zip(histogram.buckets, histogram.counts):
+                yield f"{name}_bucket{labels(**label_values, le=upper)} {count}"
+            yield f"{name}_bucket{labels(**label_values, le='+Inf')} {histogram.count}"
+            yield f"{name}_sum{labels(**label_values)} {histogram.sum}"
+            yield f"{name}_count{labels(**label_values)} {histogram.count}"
+
+        lines = []
+        with self._lock:
+            lines.append("# HELP hotwallet_phase_duration_seconds 조회 단계별 소요시간")
+            lines.append("# TYPE hotwallet_phase_duration_seconds histogram")
+            for (chain, phase), histogram in sorted(self._phases.items()):
+                lines.extend(histogram_lines("hotwallet_phase_duration_seconds", histogram, chain=chain, phase=phase))
+
+            lines.append("# HELP hotwallet_http_request_duration_seconds 외부 호스트별 HTTP 요청 지연")
+            lines.append("# TYPE hotwallet_http_request_duration_seconds histogram")
+            for host, histogram in sorted(self._hosts.items()):
+                lines.extend(histogram_lines("hotwallet_http_request_duration_seconds", histogram, host=host))
+
+            lines.append("# HELP hotwallet_http_requests_total 외부 호스트별 HTTP 요청 수 (결과별)")
+            lines.append("# TYPE hotwallet_http_requests_total counter")
+            for (host, outcome), count in sorted(self._outcomes.items()):
+                lines.append(f"hotwallet_http_requests_total{labels(host=host, outcome=outcome)} {count}")
+
+            lines.append("# HELP hotwallet_retries_total 외부 호스트별 재시도 수 (사유별)")
+            lines.append("# TYPE hotwallet_retries_total counter")
+            for (host, reason), count in sorted(self._retries.items()):
+                lines.append(f"hotwallet_retries_total{labels(host=host, reason=reason)} {count}")
+        return "\n".join(lines) + "\n"
+
+@shared_resource
+def get_metrics():
+    """프로세스 전역 메트릭"""
+    return MetricsRegistry()
+
+def start_metrics_server(port=None, host="127.0.0.1"):
+    """
+    /metrics에서 Prometheus 텍스트를 제공하는 HTTP 서버를 백그라운드 스레드로 시작 (주소별로 프로세스당 한 번)
+
+    Args:
+        port: 포트 (None이면 HOTWALLET_METRICS_PORT, 둘 다 없으면 시작하지 않음)
+
+    Returns:
+        ThreadingHTTPServer 또는 None (설정 없음/포트 사용 중)
+    """
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    # 인자 없이 부른 경우와 같은 포트를 직접 넘긴 경우가 같은 서버를 공유하도록 (host, int 포트)로 정규화
+    return serve_metrics(host, int(port))
+
+@shared_resource
+def serve_metrics(host, port):
+    """(host, port)에 메트릭 서버를 띄움 (start_metrics_server에서 포트를 정한 뒤 호출)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = get_metrics().render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError:
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+# ============================================================
+# HTTP 녹화/재생 카세트 (실제 새로고침을 한 번 녹화해서 네트워크 없이 재현)
+# ============================================================
+# 환경변수: HOTWALLET_CASSETTE=파일경로, HOTWALLET_CASSETTE_MODE=record|replay (기본 replay),
+#           HOTWALLET_CASSETTE_LATENCY=재생 지연 배율 (1=녹화 당시 지연 그대로, 0=지연 없음)
+# http_get과 RPC 세션(Web3 HTTPProvider, JSON-RPC 배치)이 모두 TrackedHTTPAdapter를 거치므로 전체 트래픽이 기록됨
+CASSETTE_SECRET_PARAMS = ("apikey", "api_key", "key")
+
+class CassetteMissError(Exception):
+    """재생 모드에서 카세트에 없는 요청"""
+    pass
+
+def rpc_endpoint_group(url):
+    """RPC URL이 속한 체인 풀 이름 ("rpc:ETH" 등, RPC_URLS에 없는 URL은 그대로)"""
+    # requests는 경로 없는 URL에 "/"를 붙이므로 끝의 "/"는 무시하고 비교
+    normalized = url.rstrip("/")
+    for chain, rpc_urls in RPC_URLS.items():
+        if any(rpc_url.rstrip("/") == normalized for rpc_url in rpc_urls):
+            return f"rpc:{chain}"
+    return url
+
+def cassette_request_key(method, url, body):
+    """
+    녹화/재생에서 같은 요청으로 볼 키와 JSON-RPC 요청 id 목록
+
+    JSON-RPC id는 실행마다 달라지므로 키에서 빼고, API 키 같은 비밀 파라미터는 URL에서 제거.
+    JSON-RPC 요청은 엔드포인트 URL 대신 체인 풀 이름으로 매칭 (점수가 없는 엔드포인트는 순서가 섞이므로
+    재생할 때 녹화와 다른 엔드포인트를 먼저 고르더라도 같은 응답을 돌려주도록)
+    """
+    from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+    parts = urlsplit(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in CASSETTE_SECRET_PARAMS])
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+    ids = None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    if body:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and "jsonrpc" in payload:
+            ids = payload.pop("id", None)
+            body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+            url = rpc_endpoint_group(url)
+        elif isinstance(payload, list):
+            ids = [item.pop("id", None) if isinstance(item, dict) else None for item in payload]
+            body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+            url = rpc_endpoint_group(url)
+    return (method, url, body or ""), ids
+
+def remap_rpc_ids(content, recorded_ids, request_ids):
+    """녹화된 JSON-RPC 응답의 id를 이번 요청의 id로 바꿈"""
+    if recorded_ids is None or request_ids is None:
+        return content
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return content
+
+    if isinstance(payload, dict):
+        if not isinstance(request_ids, list):
+            payload["id"] = request_ids
+    elif isinstance(payload, list) and isinstance(recorded_ids, list):
+        id_map = dict(zip(map(json.dumps, recorded_ids), request_ids))
+        for item in payload:
+            if isinstance(item, dict) and json.dumps(item.get("id")) in id_map:
+                item["id"] = id_map[json.dumps(item["id"])]
+    return json.dumps(payload).encode()
+
+class Cassette:
+    """
+    HTTP 요청/응답 녹화 파일 (한 줄에 요청 하나인 JSON Lines, .gz 확장자면 gzip 압축)
+
+    record: 실제로 요청을 보내고 요청/응답/소요시간을 파일에 추가
+    replay: 같은 키의 녹화를 녹화 순서대로 돌려주고 (마지막 것은 계속 재사용), 없으면 CassetteMissError
+    """
+
+    def __init__(self, path, mode="replay", latency_scale=1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"카세트 모드는 record 또는 replay: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._positions = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if mode == "replay":
+            with self._open("rt") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    key = (entry["method"], entry["url"], entry["body"])
+                    self._entries.setdefault(key, []).append(entry)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # 녹화는 항상 새 파일로 시작
+            with self._open("wt"):
+                pass
+
+    def _open(self, mode):
+        import gzip
+
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def record(self, key, ids, elapsed, status=None, headers=None, content=None, error=None):
+        """요청 하나의 결과를 파일에 추가 (content는 bytes, 연결 실패는 error에 메시지)"""
+        method, url, body = key
+        entry = {"method": method, "url": url, "body": body, "ids": ids, "elapsed": round(elapsed, 4)}
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["status"] = status
+            entry["content_type"] = headers.get("Content-Type", "")
+            entry["content"] = content.decode("utf-8", "replace")
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            with self._open("at") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    def lookup(self, key):
+        """재생할 녹화 (없으면 None)"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = min(position + 1, len(entries) - 1)
+            self.hits += 1
+            return entries[position]
+
+    def stats(self):
+        """녹화/재생 현황 (디버깅용)"""
+        with self._lock:
+            return {
+                "path": self.path,
+                "mode": self.mode,
+                "recorded": self.recorded,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+_cassette = {"instance": None, "loaded": False}
+
+def configure_cassette(path=None, mode="replay", latency_scale=1.0):
+    """
+    카세트 사용 설정 (path=None이면 해제). 환경변수보다 우선
+
+    이미 만들어진 세션에도 바로 적용됨 (어댑터가 요청마다 현재 카세트를 확인)
+    """
+    _cassette["instance"] = Cassette(path, mode, latency_scale) if path else None
+    _cassette["loaded"] = True
+    return _cassette["instance"]
+
+def get_cassette():
+    """현재 카세트 (환경변수 설정은 처음 조회할 때 읽음, 사용하지 않으면 None)"""
+    if not _cassette["loaded"]:
+        path = os.environ.get("HOTWALLET_CASSETTE")
+        if path:
+            configure_cassette(
+                path,
+                os.environ.get("HOTWALLET_CASSETTE_MODE", "replay"),
+                float(os.environ.get("HOTWALLET_CASSETTE_LATENCY", "1"))
+            )
+        _cassette["loaded"] = True
+    return _cassette["instance"]
+
+@functools.lru_cache(maxsize=None)
+def tracked_http_adapter_class():
+    """TrackedHTTPAdapter 클래스 (requests를 처음 사용할 때 정의)"""
+
+    class TrackedHTTPAdapter(requests.adapters.HTTPAdapter):
+        """요청마다 호스트별 지연/결과를 메트릭에 기록하고, 카세트가 설정되어 있으면 녹화하거나 녹화된 응답을 돌려주는 HTTPAdapter"""
+
+        def send(self, request, **kwargs):
+            host = url_host(request.url)
+            started = time.monotonic()
+            try:
+                response = self._send(request, **kwargs)
+            except Exception:
+                get_metrics().observe_request(host, time.monotonic() - started, "error")
+                raise
+            if response.status_code == 429:
+                outcome = "rate_limited"
+            elif response.status_code >= 500:
+                outcome = "error"
+            else:
+                outcome = "ok"
+            get_metrics().observe_request(host, time.monotonic() - started, outcome)
+            return response
+
+        def _send(self, request, **kwargs):
+            cassette = get_cassette()
+            if cassette is None:
+                return super().send(request, **kwargs)
+
+            key, ids = cassette_request_key(request.method, request.url, request.body)
+            if cassette.mode == "record":
+                started = time.monotonic()
+                try:
+                    response = super().send(request, **kwargs)
+                except Exception as e:
+                    cassette.record(key, ids, time.monotonic() - started, error=f"{type(e).__name__}: {e}"[:200])
+                    raise
+                cassette.record(key, ids, time.monotonic() - started, response.status_code, response.headers, response.content)
+                return response
+
+            entry = cassette.lookup(key)
+            if entry is None:
+                raise requests.exceptions.ConnectionError(CassetteMissError(f"{key[0]} {key[1]}"), request=request)
+            if cassette.latency_scale > 0:
+                time.sleep(entry["elapsed"] * cassette.latency_scale)
+            if "error" in entry:
+                raise requests.exceptions.ConnectionError(entry["error"], request=request)
+
+            response = requests.models.Response()
+            response.status_code = entry["status"]
+            response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": entry["content_type"]})
+            response._content = remap_rpc_ids(entry["content"].encode("utf-8"), entry["ids"], ids)
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            response.reason = "Replayed"
+            response.connection = self
+            return response
+
+    return TrackedHTTPAdapter
+
+def new_http_session(pool_maxsize=10, pool_block=False):
+    """TrackedHTTPAdapter를 단 keep-alive 세션"""
+    session = requests.Session()
+    adapter = tracked_http_adapter_class()(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@shared_resource
+def get_http_session():
+    """Explorer/시장 데이터 API 공용 세션 (호스트별 연결 재사용)"""
+    return new_http_session(pool_maxsize=ENGINE_THREADS)
+
+# ============================================================
+# 서킷 브레이커 (죽은 호스트/RPC는 대기 없이 즉시 실패)
+# ============================================================
+# 연속 실패가 이 횟수에 도달하면 서킷을 엶
+CIRCUIT_FAILURE_THRESHOLD = 5
+# 서킷이 열린 뒤 단일 probe 요청을 허용하기까지 대기 시간 (초)
+CIRCUIT_OPEN_SECONDS = 30
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않은 경우"""
+    pass
+
+class CircuitBreaker:
+    """호스트/엔드포인트별 서킷 브레이커 (closed → open → half-open, 스레드/세션 간 공유)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, open_seconds=CIRCUIT_OPEN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def _get(self, key):
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = {"state": self.CLOSED, "failures": 0, "opened_at": 0}
+        return circuit
+
+    def allow(self, key):
+        """요청을 보내도 되는지 확인 (half-open 상태에서는 probe 1건만 허용)"""
+        with self._lock:
+            circuit = self._get(key)
+            if circuit["state"] == self.CLOSED:
+                return True
+            if circuit["state"] == self.OPEN and time.monotonic() - circuit["opened_at"] >= self.open_seconds:
+                circuit["state"] = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self, key):
+        with self._lock:
+            circuit = self._get(key)
+            circuit["state"] = self.CLOSED
+            circuit["failures"] = 0
+
+    def record_failure(self, key):
+        with self._lock:
+            circuit = self._get(key)
+            circuit["failures"] += 1
+            if circuit["state"] == self.HALF_OPEN or circuit["failures"] >= self.failure_threshold:
+                circuit["state"] = self.OPEN
+                circuit["opened_at"] = time.monotonic()
+
+    def open_circuits(self):
+        """현재 열려 있는(half-open 포함) 서킷 목록"""
+        with self._lock:
+            return [key for key, circuit in self._circuits.items() if circuit["state"] != self.CLOSED]
+
+@shared_resource
+def get_circuit_breaker():
+    """프로세스 전역 서킷 브레이커"""
+    return CircuitBreaker()
+
+def http_get(url, limiter=None, **kwargs):
+    """
+    서킷 브레이커를 거치는 GET 요청 (Explorer/CoinGecko/1inch/DexScreener 공용, 카세트 녹화/재생 대상)
+
+    호스트 단위로 서킷을 관리하며, 연결 오류/타임아웃/5xx/429를 실패로 기록
+
+    Args:
+        limiter: 요청 전에 acquire()할 속도 제한기 (서킷이 열려 있으면 대기 없이 바로 실패하도록 서킷 확인 뒤에 대기)
+    """
+    from urllib.parse import urlparse
+
+    host = urlparse(url).netloc
+    breaker = get_circuit_breaker()
+    if not breaker.allow(host):
+        raise CircuitOpenError(host)
+    if limiter is not None:
+        limiter.acquire()
+
+    try:
+        res = get_http_session().get(url, **kwargs)
+    except Exception:
+        breaker.record_failure(host)
+        raise
+
+    if res.status_code >= 500 or res.status_code == 429:
+        breaker.record_failure(host)
+    else:
+        breaker.record_success(host)
+    return res
+
+# ============================================================
+# 시장 데이터 공유 캐시 (소스별 TTL + LRU + 동일 요청 합치기)
+# ============================================================
+# 소스별 캐시 유지 시간 (초)
+MARKET_CACHE_TTLS = {
+    "coingecko": 120,
+    "1inch": 60,
+    "dexscreener": 60
+}
+# 조회 실패 결과도 잠깐 캐시해서 throttling 중인 API에 요청이 몰리지 않게 함
+MARKET_CACHE_FAILURE_TTL = 15
+MARKET_CACHE_MAX_ENTRIES = 512
+
+class MarketDataCache:
+    """TTL/LRU 캐시 + single-flight (같은 키의 동시 요청은 HTTP 요청 1건을 공유)"""
+
+    def __init__(self, max_entries=MARKET_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (result, 만료 시각)
+        self._inflight = {}            # key -> {"event", "result", "error"}
+
+    def get_or_fetch(self, key, ttl, fetch, is_failure=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = {"event": threading.Event(), "result": None, "error": None}
+
+        # 다른 세션이 이미 같은 요청 중이면 그 결과를 기다림
+        if not leader:
+            flight["event"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+
+        try:
+            result = fetch()
+            flight["result"] = result
+            expires_in = MARKET_CACHE_FAILURE_TTL if is_failure and is_failure(result) else ttl
+            with self._lock:
+                self._entries[key] = (result, time.monotonic() + expires_in)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return result
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight["event"].set()
+
+@shared_resource
+def get_market_data_cache():
+    """프로세스 전역 시장 데이터 캐시"""
+    return MarketDataCache()
+
+def market_cached(source, is_failure=None):
+    """시장 데이터 조회 함수를 소스별 TTL 공유 캐시로 감싸는 데코레이터 (인자 문자열은 소문자로 정규화)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            normalized = tuple(arg.lower() if isinstance(arg, str) else arg for arg in args)
+            key = (source, func.__name__, normalized, tuple(sorted(kwargs.items())))
+            return get_market_data_cache().get_or_fetch(
+                key,
+                MARKET_CACHE_TTLS[source],
+                lambda: func(*args, **kwargs),
+                is_failure
+            )
+        return wrapper
+    return decorator
+
+# ============================================================
+# RPC 엔드포인트 점수 (지연시간/에러율 기반 선택)
+# ============================================================
+# EWMA 가중치 (최근 측정값 비중)
+ENDPOINT_EWMA_ALPHA = 0.3
+# 측정 기록이 없는 엔드포인트의 기본 지연시간 (초)
+ENDPOINT_DEFAULT_LATENCY = 1.0
+# 연속 실패가 이 횟수 이상이면 비정상으로 보고 후순위로 밀어냄
+ENDPOINT_MAX_CONSECUTIVE_FAILURES = 3
+# 429 이후 패널티를 주는 기간 (초)
+ENDPOINT_RATE_LIMIT_PENALTY_SECONDS = 60
+# 비정상 엔드포인트 백그라운드 재확인 주기 (초)
+ENDPOINT_PROBE_INTERVAL = 30
+# 백분위 계산에 쓰는 최근 지연시간 샘플 수
+ENDPOINT_LATENCY_SAMPLES = 100
+
+def percentile(values, pct):
+    """값 목록의 pct 백분위 (nearest-rank)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+class EndpointStats:
+    """엔드포인트별 지연시간/에러율/429 통계"""
+
+    def __init__(self):
+        self.latency = None          # EWMA 지연시간 (초)
+        self.error_rate = 0.0        # EWMA 에러율 (0~1)
+        self.rate_limited = 0        # 429 누적 횟수
+        self.last_rate_limited = 0
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.samples = deque(maxlen=ENDPOINT_LATENCY_SAMPLES)  # 최근 성공 지연시간 (백분위 계산용)
+
+class EndpointRegistry:
+    """RPC 엔드포인트 점수를 기록하고 가장 좋은 순서로 정렬 (스레드/세션 간 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._probe_targets = set()
+        self._prober = None
+
+    def _get(self, url):
+        stats = self._stats.get(url)
+        if stats is None:
+            stats = self._stats[url] = EndpointStats()
+        return stats
+
+    def record(self, url, latency, ok, rate_limited=False):
+        """요청 결과 기록"""
+        alpha = ENDPOINT_EWMA_ALPHA
+        with self._lock:
+            stats = self._get(url)
+            stats.requests += 1
+            stats.error_rate = (1 - alpha) * stats.error_rate + alpha * (0.0 if ok else 1.0)
+            if rate_limited:
+                stats.rate_limited += 1
+                stats.last_rate_limited = time.time()
+
+            if ok:
+                stats.latency = latency if stats.latency is None else (1 - alpha) * stats.latency + alpha * latency
+                stats.samples.append(latency)
+                stats.consecutive_failures = 0
+                self._probe_targets.discard(url)
+                return
+
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= ENDPOINT_MAX_CONSECUTIVE_FAILURES:
+                self._probe_targets.add(url)
+                self._ensure_prober()
+
+    def latency_percentile(self, url, pct):
+        """최근 성공 요청 지연시간의 백분위 (기록 없으면 None)"""
+        with self._lock:
+            stats = self._stats.get(url)
+            samples = list(stats.samples) if stats else []
+        return percentile(samples, pct)
+
+    def is_healthy(self, url):
+        with self._lock:
+            stats = self._stats.get(url)
+            return stats is None or stats.consecutive_failures < ENDPOINT_MAX_CONSECUTIVE_FAILURES
+
+    def score(self, url):
+        """낮을수록 좋은 점수 (지연시간 x 에러율 가중 + 429 패널티)"""
+        with self._lock:
+            stats = self._stats.get(url)
+            if stats is None:
+                return ENDPOINT_DEFAULT_LATENCY
+            latency = stats.latency if stats.latency is not None else ENDPOINT_DEFAULT_LATENCY
+            score = latency * (1 + 4 * stats.error_rate)
+            if time.time() - stats.last_rate_limited < ENDPOINT_RATE_LIMIT_PENALTY_SECONDS:
+                score += 5.0
+            return score
+
+    def ranked(self, rpc_urls):
+        """정상 엔드포인트를 점수순으로, 비정상 엔드포인트는 마지막 수단으로 뒤에 배치"""
+        import random
+
+        rpc_list = rpc_urls.copy() if isinstance(rpc_urls, list) else [rpc_urls]
+        # 점수가 같은(기록 없는) 엔드포인트끼리는 부하 분산을 위해 섞음
+        random.shuffle(rpc_list)
+        return sorted(rpc_list, key=lambda url: (not self.is_healthy(url), self.score(url)))
+
+    def snapshot(self):
+        """디버깅 표시용 통계 사본"""
+        with self._lock:
+            return {
+                url: {
+                    "latency_ms": round(stats.latency * 1000) if stats.latency is not None else None,
+                    "error_rate": round(stats.error_rate, 3),
+                    "rate_limited": stats.rate_limited,
+                    "requests": stats.requests,
+                    "healthy": stats.consecutive_failures < ENDPOINT_MAX_CONSECUTIVE_FAILURES
+                }
+                for url, stats in self._stats.items()
+            }
+
+    def _ensure_prober(self):
+        """
+        비정상 엔드포인트 재확인 스레드 시작 (lock 보유 상태에서 호출)
+
+        _prober는 스레드가 lock 안에서 종료를 결정할 때만 None으로 바뀌므로,
+        종료 직전에 등록된 대상도 새 스레드가 이어받음 (is_alive()로 판단하면 그 사이 등록된 대상이 버려짐)
+        """
+        if self._prober is not None:
+            return
+        self._prober = threading.Thread(target=self._probe_loop, name="rpc-endpoint-prober", daemon=True)
+        self._prober.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(ENDPOINT_PROBE_INTERVAL)
+            with self._lock:
+                targets = list(self._probe_targets)
+                if not targets:
+                    # 대상 확인과 종료 표시를 같은 lock 안에서 처리 (record()의 등록과 원자적으로)
+                    self._prober = None
+                    return
+            for url in targets:
+                try:
+                    # TrackedHTTPProvider가 결과를 기록하므로 성공하면 자동으로 정상 복귀
+                    get_web3(url, timeout=5).eth.block_number
+                except Exception:
+                    pass
+
+@shared_resource
+def get_endpoint_registry():
+    """프로세스 전역 엔드포인트 점수표"""
+    return EndpointRegistry()
+
+def is_rate_limit_error(error):
+    """429/rate limit 에러 여부"""
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "too many requests" in message
+
+@functools.lru_cache(maxsize=None)
+def tracked_http_provider_class():
+    """TrackedHTTPProvider 클래스 (web3를 처음 사용할 때 정의)"""
+
+    class TrackedHTTPProvider(Web3.HTTPProvider):
+        """서킷 브레이커를 거치고, 요청마다 지연시간과 성공 여부를 엔드포인트 점수표에 기록하는 HTTPProvider"""
+
+        def make_request(self, method, params):
+            breaker = get_circuit_breaker()
+            if not breaker.allow(self.endpoint_uri):
+                raise CircuitOpenError(self.endpoint_uri)
+
+            started = time.monotonic()
+            try:
+                response = super().make_request(method, params)
+            except Exception as e:
+                breaker.record_failure(self.endpoint_uri)
+                get_endpoint_registry().record(self.endpoint_uri, time.monotonic() - started, ok=False, rate_limited=is_rate_limit_error(e))
+                raise
+
+            # revert 등 컨트랙트 에러는 엔드포인트 문제가 아니므로 rate limit 에러만 실패로 기록
+            error = response.get("error") if isinstance(response, dict) else None
+            rate_limited = bool(error) and is_rate_limit_error(error)
+            if rate_limited:
+                breaker.record_failure(self.endpoint_uri)
+            else:
+                breaker.record_success(self.endpoint_uri)
+            get_endpoint_registry().record(self.endpoint_uri, time.monotonic() - started, ok=not rate_limited, rate_limited=rate_limited)
+            return response
+
+    return TrackedHTTPProvider
+
+# ============================================================
+# RPC 프로바이더 풀 (엔드포인트별 Web3/keep-alive 세션 재사용)
+# ============================================================
+# 엔드포인트당 최대 동시 연결 수
+RPC_POOL_MAXSIZE = 10
+
+class RpcProviderPool:
+    """RPC URL별 Web3 인스턴스와 keep-alive HTTP 세션을 재사용하는 풀 (thread-safe)"""
+
+    def __init__(self, pool_maxsize=RPC_POOL_MAXSIZE):
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._web3s = {}
+
+    def get_session(self, rpc_url):
+        """엔드포인트 전용 keep-alive 세션 (연결 수 제한)"""
+        with self._lock:
+            session = self._sessions.get(rpc_url)
+            if session is None:
+                # pool_block=True: 연결 수가 한도에 도달하면 새 연결을 만들지 않고 대기
+                session = new_http_session(pool_maxsize=self.pool_maxsize, pool_block=True)
+                self._sessions[rpc_url] = session
+            return session
+
+    def get_web3(self, rpc_url, timeout=15):
+        """풀에서 Web3 인스턴스 조회 (없으면 생성, is_connected 확인 없이 바로 사용)"""
+        key = (rpc_url, timeout)
+        with self._lock:
+            w3 = self._web3s.get(key)
+        if w3 is not None:
+            return w3
+
+        session = self.get_session(rpc_url)
+        w3 = Web3(tracked_http_provider_class()(
+            rpc_url,
+            request_kwargs={'timeout': timeout},
+            session=session,
+            # 재시도는 호출하는 쪽에서 다른 RPC로 넘어가며 처리
+            exception_retry_configuration=None
+        ))
+
+        with self._lock:
+            return self._web3s.setdefault(key, w3)
+
+@shared_resource
+def get_rpc_pool():
+    """프로세스 전역 RPC 풀"""
+    return RpcProviderPool()
+
+def get_web3(rpc_url, timeout=15):
+    """풀링된 Web3 인스턴스 반환"""
+    return get_rpc_pool().get_web3(rpc_url, timeout)
+
+# ============================================================
+# 헤지 요청 (느린 엔드포인트로 인한 꼬리 지연 감소)
+# ============================================================
+# 헤지를 허용하는 읽기 전용 메서드
+HEDGEABLE_METHODS = {"eth_call", "eth_blockNumber", "eth_getLogs"}
+# 첫 엔드포인트가 이 백분위 지연시간 안에 응답하지 않으면 두 번째 엔드포인트로 헤지
+HEDGE_LATENCY_PERCENTILE = 95
+HEDGE_MIN_DELAY = 0.05
+# 헤지 상한: 요청 1건당 적립되는 헤지 토큰 비율과 최대 적립량
+# (정상 엔드포인트의 부하가 두 배가 되지 않도록 전체 요청의 약 10%로 제한)
+HEDGE_MAX_RATIO = 0.1
+HEDGE_BURST = 5
+
+class RpcCallError(Exception):
+    """JSON-RPC 응답에 error가 포함된 경우 (code/rpc_message는 error 객체의 값)"""
+
+    def __init__(self, message, code=None, rpc_message=None):
+        super().__init__(message)
+        self.code = code
+        self.rpc_message = rpc_message if rpc_message is not None else message
+
+class HedgeBudget:
+    """헤지 요청 수를 전체 요청 대비 일정 비율로 제한하는 토큰 버킷"""
+
+    def __init__(self, ratio=HEDGE_MAX_RATIO, burst=HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self.requests = 0
+        self.hedges = 0
+
+    def on_request(self):
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_hedge(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+@shared_resource
+def get_hedge_budget():
+    """프로세스 전역 헤지 예산"""
+    return HedgeBudget()
+
+@shared_resource
+def get_hedge_executor():
+    """헤지 요청 전용 스레드 풀"""
+    return ThreadPoolExecutor(max_workers=16, thread_name_prefix="rpc-hedge")
+
+def rpc_request(rpc_url, method, params, timeout=15):
+    """풀링된 프로바이더로 단일 JSON-RPC 요청 실행 후 result 반환"""
+    response = get_web3(rpc_url, timeout).provider.make_request(method, params)
+    if "error" in response:
+        error = response["error"]
+        if isinstance(error, dict):
+            raise RpcCallError(str(error)[:200], code=error.get("code"), rpc_message=str(error.get("message", "")))
+        raise RpcCallError(str(error)[:200])
+    return response.get("result")
+
+def hedged_rpc_request(rpc_urls, method, params, timeout=15, hedge=True):
+    """
+    점수 좋은 엔드포인트부터 요청하고, 읽기 메서드는 느릴 경우 다음 엔드포인트로 헤지
+
+    첫 엔드포인트가 자신의 p95 지연시간 안에 응답하지 않으면 (헤지 예산이 남아 있을 때)
+    다음 엔드포인트에도 같은 요청을 보내고 먼저 성공한 응답을 사용
+    """
+    registry = get_endpoint_registry()
+    rpc_list = registry.ranked(rpc_urls)
+    can_hedge = hedge and method in HEDGEABLE_METHODS
+    budget = get_hedge_budget()
+    last_error = None
+
+    index = 0
+    while index < len(rpc_list):
+        primary = rpc_list[index]
+        index += 1
+
+        if not can_hedge or index >= len(rpc_list):
+            try:
+                return rpc_request(primary, method, params, timeout)
+            except Exception as e:
+                last_error = e
+                if index < len(rpc_list):
+                    get_metrics().count_retry(url_host(primary), "failover")
+                continue
+
+        budget.on_request()
+        executor = get_hedge_executor()
+        pending = {executor.submit(rpc_request, primary, method, params, timeout)}
+
+        hedge_delay = registry.latency_percentile(primary, HEDGE_LATENCY_PERCENTILE) or ENDPOINT_DEFAULT_LATENCY
+        done, _ = wait(pending, timeout=max(HEDGE_MIN_DELAY, hedge_delay))
+        if not done and budget.try_hedge():
+            secondary = rpc_list[index]
+            index += 1
+            get_metrics().count_retry(url_host(secondary), "hedge")
+            pending.add(executor.submit(rpc_request, secondary, method, params, timeout))
+
+        # 먼저 성공한 응답 사용 (늦게 끝난 요청도 점수표에는 기록됨)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+
+        if index < len(rpc_list):
+            get_metrics().count_retry(url_host(primary), "failover")
+
+    raise last_error or RpcCallError("사용 가능한 RPC 없음")
+
+@shared_resource
+def get_refresh_durations():
+    """최근 새로고침 소요시간 기록 (p99 표시용)"""
+    return deque(maxlen=500)
+
+# ============================================================
+# 시간 포맷팅 함수 (몇 분 전, 몇 시간 전 등)
+# ============================================================
+def format_time_ago(timestamp):
+    """타임스탬프를 '몇 분 전' 형식으로 변환"""
+    if not timestamp:
+        return "-"
+
+    now = datetime.now()
+    tx_time = datetime.fromtimestamp(timestamp)
+    diff = now - tx_time
+
+    seconds = diff.total_seconds()
+
+    if seconds < 60:
+        return f"{int(seconds)}초 전"
+    elif seconds < 3600:
+        minutes = int(seconds / 60)
+        return f"{minutes}분 전"
+    elif seconds < 86400:
+        hours = int(seconds / 3600)
+        return f"{hours}시간 전"
+    else:
+        days = int(seconds / 86400)
+        return f"{days}일 전"
+
+def format_amount(amount):
+    """금액을 K, M 단위로 포맷팅"""
+    if amount is None:
+        return "-"
+    if amount >= 1_000_000:
+        return f"{amount/1_000_000:.2f}M"
+    elif amount >= 1_000:
+        return f"{amount/1_000:.2f}K"
+    else:
+        return f"{amount:.2f}"
+
+# ============================================================
+# Explorer API 호출 속도 제한 (토큰 버킷)
+# ============================================================
+# 호스트별 기본 허용 호출 수 (calls/sec). 유료 플랜이면 Secrets(또는 configure())에서 조정:
+# [explorer_rate_limits]
+# "api.etherscan.io" = 10
+EXPLORER_DEFAULT_RATE_LIMITS = {
+    "api.etherscan.io": 5,
+    "api.routescan.io": 2
+}
+EXPLORER_FALLBACK_RATE_LIMIT = 2
+
+def get_explorer_rate_limit(host):
+    """Explorer 호스트의 허용 calls/sec 조회 (configure() 설정 우선)"""
+    configured = _settings["explorer_rate_limits"].get(host)
+    if configured:
+        return float(configured)
+    return EXPLORER_DEFAULT_RATE_LIMITS.get(host, EXPLORER_FALLBACK_RATE_LIMIT)
+
+class TokenBucket:
+    """thread-safe 토큰 버킷 (rate calls/sec, 버스트 없이 균등 간격으로 허용)"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+class RateLimiterRegistry:
+    """(호스트, API 키)별 토큰 버킷 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def get(self, host, api_key, rate):
+        key = (host, api_key)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.rate != rate:
+                bucket = self._buckets[key] = TokenBucket(rate)
+            return bucket
+
+@shared_resource
+def get_rate_limiter_registry():
+    """프로세스 전역 Explorer 속도 제한기"""
+    return RateLimiterRegistry()
+
+def get_explorer_limiter(api_url, api_key):
+    """Explorer API URL과 키에 해당하는 토큰 버킷"""
+    from urllib.parse import urlparse
+
+    host = urlparse(api_url).netloc
+    return get_rate_limiter_registry().get(host, api_key, get_explorer_rate_limit(host))
+
+# ============================================================
+# 증분 출금 추적 (지갑별 마지막 조회 블록 기억)
+# ============================================================
+class WithdrawalTracker:
+    """(체인, 토큰, 지갑)별로 마지막으로 본 블록과 최근 출금 정보를 저장 (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    @staticmethod
+    def _key(chain, token_contract, wallet):
+        return (chain, token_contract.lower(), wallet.lower())
+
+    def get(self, chain, token_contract, wallet):
+        """저장된 상태 {"last_block", "withdrawal"} 또는 None"""
+        with self._lock:
+            state = self._states.get(self._key(chain, token_contract, wallet))
+            return dict(state) if state else None
+
+    def update(self, chain, token_contract, wallet, last_block, withdrawal=None):
+        """마지막 블록 갱신 (새 출금이 없으면 기존 출금 정보 유지)"""
+        key = self._key(chain, token_contract, wallet)
+        with self._lock:
+            state = self._states.setdefault(key, {"last_block": 0, "withdrawal": None})
+            state["last_block"] = max(state["last_block"], last_block)
+            if withdrawal is not None:
+                state["withdrawal"] = withdrawal
+
+@shared_resource
+def get_withdrawal_tracker():
+    """프로세스 전역 증분 출금 추적 상태"""
+    return WithdrawalTracker()
+
+# ============================================================
+# 최근 출금 정보 조회 함수 (Etherscan API V2 사용)
+# ============================================================
+def get_last_withdrawal(chain, wallet, token_contract, decimals=18, incremental=True):
+    """
+    해당 지갑에서 특정 토큰의 최근 출금(전송) 정보 조회
+
+    incremental=True이면 이전 조회에서 본 마지막 블록 이후(startblock=last_seen+1)만 조회하고,
+    새 출금이 없으면 저장된 최근 출금 정보를 그대로 반환
+
+    Returns:
+        dict: {
+            "amount": 출금 금액,
+            "to": 받는 주소,
+            "timestamp": 출금 시간 (unix timestamp),
+            "tx_hash": 트랜잭션 해시
+        }
+        또는 None (조회 실패/없음)
+    """
+    api_key = get_explorer_api_key(chain)
+
+    # AVAX는 별도 API 사용
+    if chain == "AVAX":
+        api_url = AVAX_API_URL
+        params = {
+            "module": "account",
+            "action": "tokentx",
+            "address": wallet,
+            "contractaddress": token_contract,
+            "page": 1,
+            "offset": 30,
+            "sort": "desc"
+        }
+        if api_key:
+            params["apikey"] = api_key
+    else:
+        # Etherscan V2 API 사용
+        chain_id = CHAIN_IDS.get(chain)
+        if not chain_id:
+            return None
+
+        api_url = ETHERSCAN_V2_API
+        params = {
+            "chainid": chain_id,
+            "module": "account",
+            "action": "tokentx",
+            "address": wallet,
+            "contractaddress": token_contract,
+            "page": 1,
+            "offset": 30,
+            "sort": "desc"
+        }
+        if api_key:
+            params["apikey"] = api_key
+
+    tracker = get_withdrawal_tracker()
+    state = tracker.get(chain, token_contract, wallet) if incremental else None
+    if state:
+        params["startblock"] = state["last_block"] + 1
+
+    def stored_withdrawal():
+        """저장된 최근 출금 정보 (출금 기록이 없으면 에러 형태)"""
+        if state["withdrawal"]:
+            return state["withdrawal"]
+        return {"error": "No OUT", "wallet": wallet[:10]}
+
+    max_retries = 3
+
+    # (호스트, API 키)별 토큰 버킷으로 허용 속도에 맞춰 호출
+    limiter = get_explorer_limiter(api_url, api_key)
+
+    for attempt in range(max_retries):
+        try:
+            res = http_get(api_url, limiter=limiter, params=params, timeout=15)
+
+            if res.status_code == 200:
+                data = res.json()
+
+                # API 에러 처리 (Rate limit, NOTOK 등)
+                if data.get("status") == "0":
+                    error_msg = data.get("message", "Unknown error").lower()
+                    # 마지막 조회 이후 새 트랜잭션 없음
+                    if state and "no transactions found" in error_msg:
+                        return stored_withdrawal()
+                    # Rate limit 또는 NOTOK은 재시도
+                    if "rate limit" in error_msg or "notok" in error_msg:
+                        if attempt < max_retries - 1:
+                            get_metrics().count_retry(url_host(api_url), "rate_limit")
+                            time.sleep(1.5 + attempt)  # 점점 더 긴 대기 (1.5초, 2.5초, 3.5초...)
+                            continue
+                    # 최종 실패시 에러 반환
+                    return {"error": data.get("message", "Unknown error"), "wallet": wallet[:10]}
+
+                if data.get("status") == "1" and data.get("result"):
+                    result_list = data.get("result", [])
+
+                    # 트랜잭션이 없는 경우
+                    if len(result_list) == 0:
+                        return {"error": "No transactions", "wallet": wallet[:10]}
+
+                    highest_block = max(int(tx.get("blockNumber", 0)) for tx in result_list)
+
+                    # 출금 트랜잭션만 필터링 (from == wallet)
+                    out_count = 0
+                    for tx in result_list:
+                        tx_from = tx.get("from", "").lower()
+                        wallet_lower = wallet.lower()
+
+                        if tx_from == wallet_lower:
+                            out_count += 1
+                            token_decimal = int(tx.get("tokenDecimal", decimals))
+                            amount = int(tx.get("value", 0)) / (10 ** token_decimal)
+
+                            withdrawal = {
+                                "amount": amount,
+                                "to": tx.get("to", ""),
+                                "timestamp": int(tx.get("timeStamp", 0)),
+                                "tx_hash": tx.get("hash", "")
+                            }
+                            tracker.update(chain, token_contract, wallet, highest_block, withdrawal)
+                            return withdrawal
+
+                    # 출금이 없는 경우 (입금만 있음): 블록만 갱신하고 기존 출금 정보 유지
+                    tracker.update(chain, token_contract, wallet, highest_block)
+                    if state:
+                        return stored_withdrawal()
+                    return {"error": f"No OUT in {len(result_list)} txs", "wallet": wallet[:10]}
+
+            return {"error": f"HTTP {res.status_code}", "wallet": wallet[:10]}
+
+        except CircuitOpenError:
+            # Explorer 호스트가 죽어 있으면 재시도 없이 즉시 반환
+            return {"error": "Explorer 서킷 열림", "wallet": wallet[:10]}
+        except Exception as e:
+            if attempt < max_retries - 1:
+                get_metrics().count_retry(url_host(api_url), "error")
+                time.sleep(0.3)
+                continue
+            return {"error": str(e)[:50], "wallet": wallet[:10]}
+
+    return None
+
+@market_cached("dexscreener", is_failure=lambda pairs: not pairs)
+def get_dexscreener_data(chain_id, token_address):
+    """DexScreener API를 통해 DEX 유동성 정보 조회"""
+    chain_map = {
+        "ETH": "ethereum",
+        "BSC": "bsc",
+        "ARB": "arbitrum",
+        "OP": "optimism",
+        "BASE": "base",
+        "AVAX": "avalanche",
+        "POL": "polygon"
+    }
+
+    try:
+        url = f"{DEXSCREENER_API}/latest/dex/tokens/{token_address}"
+        headers = {"Accept": "application/json"}
+
+        res = http_get(url, headers=headers, timeout=10)
+
+        if res.status_code == 200:
+            data = res.json()
+            pairs = data.get("pairs", [])
+
+            chain_name = chain_map.get(chain_id)
+            filtered_pairs = [p for p in pairs if p.get("chainId") == chain_name]
+            filtered_pairs.sort(key=lambda x: float(x.get("liquidity", {}).get("usd", 0)), reverse=True)
+
+            return filtered_pairs[:5]
+
+        return []
+
+    except Exception as e:
+        return []
+
+def format_liquidity_info(pairs):
+    """DEX 유동성 정보를 포맷팅"""
+    liquidity_info = []
+
+    for pair in pairs:
+        dex_name = pair.get("dexId", "Unknown").upper()
+        pair_address = pair.get("pairAddress", "")
+        liquidity_usd = float(pair.get("liquidity", {}).get("usd", 0))
+        base_token = pair.get("baseToken", {})
+        quote_token = pair.get("quoteToken", {})
+
+        token_liquidity_usd = liquidity_usd / 2
+
+        info = {
+            "name": f"🏊 {dex_name} ({quote_token.get('symbol', 'UNKNOWN')} 페어)",
+            "address": pair_address,
+            "liquidity_usd": token_liquidity_usd,
+            "price_usd": float(pair.get("priceUsd", 0)),
+            "volume_24h": float(pair.get("volume", {}).get("h24", 0))
+        }
+
+        liquidity_info.append(info)
+
+    return liquidity_info
+
+# ============================================================
+# 토큰 메타데이터 영구 캐시 (SQLite, 세션/프로세스 간 공유)
+# ============================================================
+# 캐시 파일 위치 (HOTWALLET_CACHE_DIR 환경변수로 변경 가능)
+CACHE_DIR = os.environ.get("HOTWALLET_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "hotwallet_tracker"))
+# 토큰 메타데이터는 거의 바뀌지 않으므로 길게 유지
+TOKEN_METADATA_TTL = 7 * 24 * 3600
+
+class TokenMetadataStore:
+    """(체인, 체크섬 주소)별 토큰 name/symbol/decimals를 SQLite에 저장 (첫 사용 시 연결)"""
+
+    def __init__(self, path, ttl=TOKEN_METADATA_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._memory = {}
+
+    def _connect(self):
+        """DB 연결 (lock 보유 상태에서 호출, 디스크를 쓸 수 없으면 메모리 캐시만 사용)"""
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS token_metadata ("
+                    "chain TEXT NOT NULL, address TEXT NOT NULL, name TEXT, symbol TEXT, "
+                    "decimals INTEGER, updated_at REAL, PRIMARY KEY (chain, address))"
+                )
+                conn.commit()
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                self._conn = False
+        return self._conn or None
+
+    def get(self, chain, token_contract):
+        """캐시된 토큰 정보 (없거나 TTL 지나면 None)"""
+        key = (chain, Web3.to_checksum_address(token_contract))
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                return dict(entry[0])
+
+            conn = self._connect()
+            if not conn:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT name, symbol, decimals, updated_at FROM token_metadata WHERE chain = ? AND address = ?",
+                    key
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+
+            if not row or now - row[3] >= self.ttl:
+                return None
+            token_info = {"name": row[0], "symbol": row[1], "decimals": row[2]}
+            self._memory[key] = (token_info, row[3])
+            return dict(token_info)
+
+    def put(self, chain, token_contract, token_info):
+        key = (chain, Web3.to_checksum_address(token_contract))
+        now = time.time()
+        with self._lock:
+            self._memory[key] = (dict(token_info), now)
+            conn = self._connect()
+            if not conn:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO token_metadata (chain, address, name, symbol, decimals, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, token_info["name"], token_info["symbol"], int(token_info["decimals"]), now)
+                )
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+@shared_resource
+def get_token_metadata_store():
+    """프로세스 전역 토큰 메타데이터 캐시"""
+    return TokenMetadataStore(os.path.join(CACHE_DIR, "token_metadata.sqlite3"))
+
+def fetch_token_info(rpc_urls, token_contract, chain=None, hedge=False):
+    """RPC 목록으로 토큰 정보 조회 (메모리 캐시 → 영구 캐시 → 집계 호출 한 번 순서)"""
+    global token_info_cache
+    cache_key = (chain, token_contract.lower())
+
+    # 캐시 확인
+    with token_info_lock:
+        if cache_key in token_info_cache:
+            return token_info_cache[cache_key]
+
+    # 영구 캐시 확인 (이미 조회한 토큰은 메타데이터 RPC 호출 없음)
+    if chain:
+        cached = get_token_metadata_store().get(chain, token_contract)
+        if cached:
+            with token_info_lock:
+                token_info_cache[cache_key] = cached
+            return cached
+
+    # name/symbol/decimals를 한 번의 집계 호출로 조회 (string/bytes32는 로컬에서 디코딩)
+    token_info = resolve_token_metadata(rpc_urls, token_contract, hedge=hedge)
+    if token_info is None or token_info["decimals"] is None:
+        # decimals를 얻지 못한 값은 캐시하지 않고 다음 수집 때 다시 조회
+        return {
+            "name": token_info["name"] if token_info else "Unknown",
+            "symbol": token_info["symbol"] if token_info else "Unknown",
+            "decimals": 18
+        }
+
+    # 캐시 저장 (잔고 계산에 필요한 decimals만 조회되면 name/symbol이 Unknown이어도 캐시)
+    with token_info_lock:
+        token_info_cache[cache_key] = token_info
+    if chain:
+        get_token_metadata_store().put(chain, token_contract, token_info)
+
+    return token_info
+
+def get_token_info(w3, token_contract, chain=None):
+    """토큰의 이름, 심볼, decimals를 조회하는 함수 (chain을 주면 영구 캐시 사용)"""
+    return fetch_token_info([w3.provider.endpoint_uri], token_contract, chain)
+
+def get_token_balance_rpc(rpc_urls, wallet, token_contract, wallet_name=None, chain_name=None, block_identifier="latest",
+                          decimals=None):
+    """
+    RPC를 통해 토큰 잔고를 조회하는 함수
+
+    Args:
+        decimals: 토큰 decimals (주면 토큰 정보 조회 생략)
+        block_identifier: 조회 블록 ("latest" 또는 int 블록 번호, web3 call()은 hex 문자열을 받지 않음)
+
+    Returns:
+        dict: {"wallet_name", "wallet", "balance", "error"} (모든 RPC 실패시 balance=None, error=마지막 에러)
+    """
+    # 지연시간/에러율 점수가 좋은 엔드포인트부터 시도
+    rpc_list = get_endpoint_registry().ranked(rpc_urls)
+
+    last_error = None
+
+    for rpc in rpc_list:
+        try:
+            w3 = get_web3(rpc, timeout=30)
+
+            # 토큰 정보 조회 (호출자가 decimals를 이미 알고 있으면 생략)
+            if decimals is None:
+                decimals = get_token_info(w3, token_contract, chain_name)["decimals"]
+
+            # 잔고 조회
+            contract = w3.eth.contract(address=checksum_address(token_contract), abi=[{
+                "constant": True,
+                "inputs": [{"name": "_owner", "type": "address"}],
+                "name": "balanceOf",
+                "outputs": [{"name": "balance", "type": "uint256"}],
+                "type": "function"
+            }])
+
+            raw_balance = contract.functions.balanceOf(checksum_address(wallet)).call(block_identifier=block_identifier)
+            balance = raw_balance / (10 ** decimals)
+
+            return {"wallet_name": wallet_name, "wallet": wallet, "balance": balance, "error": None}
+
+        except CircuitOpenError as e:
+            # 서킷이 열린 RPC는 대기 없이 바로 다음 RPC로
+            last_error = str(e)
+            continue
+        except Exception as e:
+            last_error = str(e)
+            if "429" in str(e):  # Rate limit error
+                time.sleep(1)  # 더 긴 대기
+            else:
+                time.sleep(0.3)  # 일반 오류시 짧은 대기
+            continue
+
+    # 모든 RPC 실패시 잔고 없음으로 반환 (0으로 채우면 실제 잔고 0과 구분되지 않음)
+    return {"wallet_name": wallet_name, "wallet": wallet, "balance": None, "error": last_error or "사용 가능한 RPC 없음"}
+
+# ============================================================
+# Multicall3 일괄 잔고 조회
+# ============================================================
+# Multicall3는 지원 체인 전체에 동일한 주소로 배포되어 있음
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# aggregate3((address,bool,bytes)[]) / balanceOf(address) 함수 셀렉터
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+# aggregate3 한 번에 묶을 최대 호출 수 (RPC 응답 크기/가스 한도 고려)
+MULTICALL_CHUNK_SIZE = 300
+
+@functools.lru_cache(maxsize=4096)
+def checksum_address(address):
+    """체크섬 주소 변환 (같은 주소는 한 번만 계산)"""
+    return Web3.to_checksum_address(address)
+
+def encode_balance_of(wallet):
+    """balanceOf(wallet) calldata 생성"""
+    return BALANCE_OF_SELECTOR + abi_encode(["address"], [checksum_address(wallet)])
+
+def multicall_aggregate3(rpc_urls, calls, block_identifier="latest", hedge=False):
+    """
+    Multicall3 aggregate3로 여러 eth_call을 묶어서 실행 (호출별 실패 허용)
+
+    Args:
+        calls: [(target 주소, calldata bytes), ...]
+
+    Returns:
+        list: [(success, return_data), ...] (calls와 같은 순서)
+    """
+    results = []
+    for start in range(0, len(calls), MULTICALL_CHUNK_SIZE):
+        chunk = calls[start:start + MULTICALL_CHUNK_SIZE]
+        payload = [(checksum_address(target), True, data) for target, data in chunk]
+        calldata = AGGREGATE3_SELECTOR + abi_encode(["(address,bool,bytes)[]"], [payload])
+        raw = hedged_rpc_request(
+            rpc_urls,
+            "eth_call",
+            [{"to": MULTICALL3_ADDRESS, "data": "0x" + calldata.hex()}, block_identifier],
+            timeout=30,
+            hedge=hedge
+        )
+        results.extend(abi_decode(["(bool,bytes)[]"], hex_to_bytes(raw))[0])
+    return results
+
+def get_token_balances_multicall(rpc_urls, wallets, token_contract, decimals=18, hedge=False, block_identifier="latest"):
+    """
+    Multicall3로 체인의 모든 지갑 잔고를 한 번에 조회
+
+    Args:
+        wallets: 지갑 주소 리스트
+        block_identifier: 조회 블록 ("latest" 또는 hex 블록 번호)
+
+    Returns:
+        dict: {지갑 주소: 잔고} (개별 호출이 실패한 지갑은 제외)
+        또는 None (모든 RPC에서 Multicall 실패)
+    """
+    calls = [(token_contract, encode_balance_of(wallet)) for wallet in wallets]
+
+    try:
+        # 점수순 엔드포인트 순회 + 헤지는 hedged_rpc_request에서 처리
+        results = multicall_aggregate3(rpc_urls, calls, block_identifier=block_identifier, hedge=hedge)
+    except Exception:
+        return None
+
+    balances = {}
+    for wallet, (success, data) in zip(wallets, results):
+        # 실패했거나 반환값이 없는 호출(컨트랙트 아님 등)은 개별 조회로 넘김
+        if success and len(data) >= 32:
+            raw_balance = int.from_bytes(data[:32], "big")
+            balances[wallet] = raw_balance / (10 ** decimals)
+    return balances
+
+# ============================================================
+# JSON-RPC 배치 전송 (Multicall 미지원 엔드포인트용)
+# ============================================================
+# 한 번의 HTTP POST에 담을 최대 요청 수 (거부되면 자동으로 반씩 분할)
+JSON_RPC_BATCH_SIZE = 100
+
+# ERC20 메타데이터 함수 셀렉터
+NAME_SELECTOR = bytes.fromhex("06fdde03")
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")
+
+class BatchRejectedError(Exception):
+    """엔드포인트가 배치 요청 자체를 거부한 경우 (크기 초과, 배치 미지원 등)"""
+    pass
+
+def post_json_rpc_batch(rpc_url, batch, timeout=30):
+    """
+    JSON-RPC 배치 배열을 한 번의 POST로 전송
+
+    Returns:
+        dict: {요청 id: 응답 객체}
+    """
+    breaker = get_circuit_breaker()
+    if not breaker.allow(rpc_url):
+        raise CircuitOpenError(rpc_url)
+
+    started = time.monotonic()
+    try:
+        res = get_rpc_pool().get_session(rpc_url).post(rpc_url, json=batch, timeout=timeout)
+    except Exception:
+        breaker.record_failure(rpc_url)
+        get_endpoint_registry().record(rpc_url, time.monotonic() - started, ok=False)
+        raise
+
+    if res.status_code >= 500 or res.status_code == 429:
+        breaker.record_failure(rpc_url)
+    else:
+        breaker.record_success(rpc_url)
+    get_endpoint_registry().record(rpc_url, time.monotonic() - started, ok=res.status_code != 429, rate_limited=res.status_code == 429)
+
+    # 429는 배치 크기 문제가 아니므로 분할하지 않고 그대로 실패 처리
+    if res.status_code == 429:
+        res.raise_for_status()
+    if res.status_code != 200:
+        raise BatchRejectedError(f"HTTP {res.status_code}")
+
+    data = res.json()
+    if not isinstance(data, list):
+        # 배치 전체에 대한 단일 에러 응답
+        error = data.get("error", data) if isinstance(data, dict) else data
+        raise BatchRejectedError(str(error)[:100])
+
+    return {item.get("id"): item for item in data if isinstance(item, dict)}
+
+def json_rpc_batch(rpc_url, calls, timeout=30, max_batch_size=JSON_RPC_BATCH_SIZE):
+    """
+    여러 JSON-RPC 호출을 배치로 실행 (거부시 배치를 반으로 나눠 재시도)
+
+    Args:
+        calls: [(method, params), ...]
+
+    Returns:
+        list: 호출별 result (개별 에러는 None, calls와 같은 순서)
+    """
+    results = [None] * len(calls)
+    ranges = [(start, min(start + max_batch_size, len(calls))) for start in range(0, len(calls), max_batch_size)]
+    ranges.reverse()
+
+    while ranges:
+        start, end = ranges.pop()
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls[start:end], start)
+        ]
+
+        try:
+            responses = post_json_rpc_batch(rpc_url, batch, timeout)
+        except BatchRejectedError:
+            if end - start <= 1:
+                raise
+            # 반으로 나눠 앞쪽부터 다시 전송
+            get_metrics().count_retry(url_host(rpc_url), "batch_split")
+            mid = (start + end) // 2
+            ranges.append((mid, end))
+            ranges.append((start, mid))
+            continue
+
+        for i in range(start, end):
+            item = responses.get(i)
+            if item and "error" not in item:
+                results[i] = item.get("result")
+
+    return results
+
+def hex_to_bytes(value):
+    """JSON-RPC hex 문자열을 bytes로 변환"""
+    if not value:
+        return b""
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+def decode_string_result(data):
+    """string 또는 bytes32로 반환된 name/symbol 값을 문자열로 디코딩"""
+    if not data:
+        return None
+    if len(data) == 32:
+        # bytes32 형태 (MKR 등 구형 토큰)
+        return data.rstrip(b"\x00").decode("utf-8", errors="ignore") or None
+    try:
+        return abi_decode(["string"], data)[0] or None
+    except Exception:
+        return None
+
+def decode_token_metadata(name_raw, symbol_raw, decimals_raw, default_decimals=18):
+    """name()/symbol()/decimals() 원시 반환값을 토큰 정보 dict로 디코딩"""
+    return {
+        "name": decode_string_result(name_raw) or "Unknown",
+        "symbol": decode_string_result(symbol_raw) or "Unknown",
+        "decimals": int.from_bytes(decimals_raw[:32], "big") if len(decimals_raw) >= 32 else default_decimals
+    }
+
+def resolve_token_metadata(rpc_urls, token_contract, hedge=False):
+    """
+    토큰 name/symbol/decimals를 한 번의 왕복으로 조회
+
+    Multicall3 aggregate3 한 번으로 세 호출의 원시 bytes를 받아 string/bytes32를 로컬에서 디코딩.
+    Multicall3가 없거나 거부되면 같은 세 eth_call을 JSON-RPC 배치 한 번으로 조회
+
+    Returns:
+        dict: {"name", "symbol", "decimals"} 또는 None (모든 RPC 실패, decimals() 응답이 없으면 decimals=None)
+    """
+    selectors = (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR)
+
+    try:
+        results = multicall_aggregate3(rpc_urls, [(token_contract, selector) for selector in selectors], hedge=hedge)
+        return decode_token_metadata(*(data if success else b"" for success, data in results), default_decimals=None)
+    except Exception:
+        pass
+
+    token = Web3.to_checksum_address(token_contract)
+    calls = [("eth_call", [{"to": token, "data": "0x" + selector.hex()}, "latest"]) for selector in selectors]
+    for rpc in get_endpoint_registry().ranked(rpc_urls):
+        try:
+            results = json_rpc_batch(rpc, calls)
+        except Exception:
+            continue
+        return decode_token_metadata(*(hex_to_bytes(r) for r in results), default_decimals=None)
+
+    return None
+
+def get_token_balances_batch(rpc_urls, wallets, token_contract, decimals=18, block_identifier="latest"):
+    """
+    JSON-RPC 배치 한 번으로 토큰 name/symbol/decimals와 모든 지갑 잔고를 조회
+
+    Args:
+        wallets: 지갑 주소 리스트
+        block_identifier: 조회 블록 ("latest" 또는 hex 블록 번호)
+
+    Returns:
+        dict: {
+            "token_info": {"name", "symbol", "decimals"},
+            "balances": {지갑 주소: 잔고} (개별 호출이 실패한 지갑은 제외)
+        }
+        또는 None (모든 RPC에서 배치 실패)
+    """
+    rpc_list = get_endpoint_registry().ranked(rpc_urls)
+
+    token = Web3.to_checksum_address(token_contract)
+
+    def eth_call(data):
+        return ("eth_call", [{"to": token, "data": "0x" + data.hex()}, block_identifier])
+
+    calls = [eth_call(NAME_SELECTOR), eth_call(SYMBOL_SELECTOR), eth_call(DECIMALS_SELECTOR)]
+    calls += [eth_call(encode_balance_of(wallet)) for wallet in wallets]
+
+    for rpc in rpc_list:
+        try:
+            results = json_rpc_batch(rpc, calls)
+        except Exception:
+            continue
+
+        token_info = decode_token_metadata(*(hex_to_bytes(r) for r in results[:3]), default_decimals=decimals)
+
+        balances = {}
+        for wallet, result in zip(wallets, results[3:]):
+            data = hex_to_bytes(result)
+            if len(data) >= 32:
+                raw_balance = int.from_bytes(data[:32], "big")
+                balances[wallet] = raw_balance / (10 ** token_info["decimals"])
+
+        return {"token_info": token_info, "balances": balances}
+
+    return None
+
+# ============================================================
+# 워치리스트 (여러 토큰 × 여러 지갑 잔고를 행렬로 한 번에 조회)
+# ============================================================
+def batch_eth_calls(rpc_urls, calls, hedge=False, block_identifier="latest"):
+    """
+    여러 eth_call을 Multicall3로 묶어서 실행하고, 실패하면 JSON-RPC 배치로 재시도
+
+    Args:
+        calls: [(target 주소, calldata bytes), ...]
+        block_identifier: 조회 블록 ("latest" 또는 hex 블록 번호)
+
+    Returns:
+        list: 호출별 반환 bytes (실패한 호출은 b"", calls와 같은 순서)
+        또는 None (모든 RPC에서 실패)
+    """
+    try:
+        results = multicall_aggregate3(rpc_urls, calls, block_identifier=block_identifier, hedge=hedge)
+        return [data if success else b"" for success, data in results]
+    except Exception:
+        pass
+
+    rpc_calls = [
+        ("eth_call", [{"to": checksum_address(target), "data": "0x" + data.hex()}, block_identifier])
+        for target, data in calls
+    ]
+    for rpc in get_endpoint_registry().ranked(rpc_urls):
+        try:
+            return [hex_to_bytes(result) for result in json_rpc_batch(rpc, rpc_calls)]
+        except Exception:
+            continue
+
+    return None
+
+def resolve_watchlist_metadata(rpc_urls, chain, tokens, hedge=False):
+    """
+    여러 토큰의 name/symbol/decimals 조회 (영구 캐시에 없는 토큰만 한 번의 집계 호출로 조회)
+
+    Returns:
+        list: 토큰별 {"name", "symbol", "decimals"} (tokens와 같은 순서, 실패시 Unknown/18)
+    """
+    store = get_token_metadata_store()
+    infos = [store.get(chain, token) for token in tokens]
+    missing = [i for i, info in enumerate(infos) if info is None]
+
+    if missing:
+        selectors = (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR)
+        calls = [(tokens[i], selector) for i in missing for selector in selectors]
+        results = batch_eth_calls(rpc_urls, calls, hedge=hedge)
+        for n, i in enumerate(missing):
+            if results is None:
+                infos[i] = {"name": "Unknown", "symbol": "Unknown", "decimals": 18}
+                continue
+            infos[i] = decode_token_metadata(*results[n * 3:n * 3 + 3], default_decimals=None)
+            # decimals() 응답이 없으면 (컨트랙트가 아니거나 조회 실패) 캐시하지 않고 기본값 사용
+            if infos[i]["decimals"] is None:
+                infos[i]["decimals"] = 18
+            else:
+                store.put(chain, tokens[i], infos[i])
+
+    return infos
+
+def get_balance_matrix(rpc_urls, wallets, tokens, decimals, hedge=False, chain=None, block_number=None):
+    """
+    지갑 × 토큰 잔고 행렬 조회 (모든 balanceOf를 Multicall 청크 몇 번으로 처리)
+
+    block_number를 주면 모든 호출을 그 블록에 고정하고, 같은 블록에서 이미 조회한 칸은 캐시에서 채움
+
+    Args:
+        wallets: 지갑 주소 리스트
+        tokens: 토큰 컨트랙트 주소 리스트
+        decimals: 토큰별 decimals 리스트 (tokens와 같은 순서)
+
+    Returns:
+        np.ndarray: shape (지갑 수, 토큰 수) float64, 조회 실패한 칸은 NaN
+    """
+    matrix = np.full((len(wallets), len(tokens)), np.nan)
+    if not wallets or not tokens:
+        return matrix
+
+    cache = get_balance_cache() if chain and block_number is not None else None
+    pending = []
+    for row, wallet in enumerate(wallets):
+        for column, token in enumerate(tokens):
+            cached = cache.get(chain, block_number, token, wallet) if cache else None
+            if cached is None:
+                pending.append((row, column))
+            else:
+                matrix[row, column] = cached
+    if not pending:
+        return matrix
+
+    block_identifier = hex(block_number) if block_number is not None else "latest"
+    calls = [(tokens[column], encode_balance_of(wallets[row])) for row, column in pending]
+    results = batch_eth_calls(rpc_urls, calls, hedge=hedge, block_identifier=block_identifier)
+    if results is None:
+        return matrix
+
+    for (row, column), data in zip(pending, results):
+        if len(data) >= 32:
+            # 단일 토큰 조회와 같은 방식으로 계산한 원본 값을 캐시 (반올림은 표시할 때만)
+            balance = int.from_bytes(data[:32], "big") / (10 ** decimals[column])
+            matrix[row, column] = balance
+            if cache:
+                cache.put(chain, block_number, tokens[column], wallets[row], balance)
+    return matrix
+
+def fetch_watchlist(chain, tokens, wallets, hedge=False):
+    """
+    워치리스트 전체 조회 (메타데이터 → 잔고 행렬)
+
+    Args:
+        tokens: 토큰 컨트랙트 주소 리스트
+        wallets: {지갑 이름: 지갑 주소}
+
+    Returns:
+        dict: {
+            "token_info": 토큰별 {"name", "symbol", "decimals"} 리스트,
+            "balances": pd.DataFrame (행: 지갑 이름, 열: 토큰 컨트랙트, 값: 잔고 float),
+            "block": 잔고를 조회한 블록 번호 (조회 실패시 None → latest)
+        }
+    """
+    rpc_urls = RPC_URLS.get(chain)
+    token_infos = resolve_watchlist_metadata(rpc_urls, chain, tokens, hedge=hedge)
+    block_number = resolve_snapshot_block(rpc_urls, hedge=hedge)
+    matrix = get_balance_matrix(
+        rpc_urls, list(wallets.values()), tokens, [info["decimals"] for info in token_infos],
+        hedge=hedge, chain=chain, block_number=block_number
+    )
+    # 토큰별로 잔고 히스토리에 누적 (조회 실패한 칸과 블록을 못 구한 수집은 제외)
+    history = get_balance_history_store()
+    collected_at = time.time()
+    for column, token in enumerate(tokens if block_number is not None else []):
+        history.append(chain, token, {
+            wallet: balance for wallet, balance in zip(wallets.values(), matrix[:, column]) if not np.isnan(balance)
+        }, ts=collected_at, block=block_number)
+
+    return {
+        "token_info": token_infos,
+        "balances": pd.DataFrame(matrix, index=list(wallets.keys()), columns=tokens),
+        "block": block_number
+    }
+
+def parse_watchlist_tokens(text):
+    """입력 텍스트에서 0x 컨트랙트 주소만 추출 (중복 제거, 입력 순서 유지)"""
+    tokens = {}
+    for address in re.findall(r"0x[0-9a-fA-F]{40}", text):
+        tokens.setdefault(address.lower(), address)
+    return list(tokens.values())
+
+# ============================================================
+# eth_getLogs 기반 출금 조회 (Explorer API 키/쿼터 불필요)
+# ============================================================
+# ERC20 Transfer(address,address,uint256) 이벤트 토픽
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# 체인별 로그 스캔 범위 (최근 블록 수, 대략 최근 몇 시간)
+LOG_LOOKBACK_BLOCKS = {
+    "ETH": 2000,       # ~12초/블록
+    "BSC": 10000,      # ~3초/블록 이하
+    "ARB": 100000,     # ~0.25초/블록
+    "OP": 10000,       # ~2초/블록
+    "BASE": 10000,     # ~2초/블록
+    "AVAX": 10000,     # ~2초/블록
+    "POL": 10000       # ~2초/블록
+}
+DEFAULT_LOG_LOOKBACK_BLOCKS = 5000
+
+# ============================================================
+# eth_getLogs 블록 범위 자동 분할 (엔드포인트별 허용 범위 학습)
+# ============================================================
+# 엔드포인트별 범위 기록이 없을 때 처음 시도할 블록 수
+LOG_RANGE_INITIAL = 5000
+LOG_RANGE_MAX = 100000
+# 범위가 학습된 한도를 꽉 채워 성공하면 이 배율만큼 한도를 다시 늘려봄
+LOG_RANGE_GROWTH = 1.25
+# 범위/결과 수 초과를 뜻하는 JSON-RPC 에러 메시지 (프로바이더마다 다름)
+LOG_RANGE_ERROR_HINTS = (
+    "block range", "range too", "range is too", "too many", "more than", "too large", "response size",
+    "block span", "exceed maximum", "exceeds max", "limit exceeded"
+)
+# 결과 수 초과 전용 에러 코드 (Infura 등: "query returned more than 10000 results")
+LOG_RANGE_ERROR_CODES = (-32005,)
+
+def is_log_range_error(error):
+    """
+    eth_getLogs 범위/결과 수 초과 에러 여부
+
+    JSON-RPC error 응답(RpcCallError)만 해당. 연결 실패/타임아웃/서킷 열림 같은 전송 에러는
+    "Max retries exceeded" 같은 메시지가 있어도 범위 문제가 아니므로 다음 엔드포인트로 넘기고 한도는 건드리지 않음
+    """
+    if not isinstance(error, RpcCallError) or is_rate_limit_error(error):
+        return False
+    message = error.rpc_message.lower()
+    return error.code in LOG_RANGE_ERROR_CODES or any(hint in message for hint in LOG_RANGE_ERROR_HINTS)
+
+class LogRangePlanner:
+    """엔드포인트별로 eth_getLogs가 받아주는 최대 블록 범위를 학습 (스레드/세션 간 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limits = {}
+
+    def limit(self, url):
+        with self._lock:
+            return self._limits.get(url, LOG_RANGE_INITIAL)
+
+    def record_failure(self, url, span):
+        """범위 에러가 난 span의 절반으로 한도를 낮춤"""
+        with self._lock:
+            current = self._limits.get(url, LOG_RANGE_INITIAL)
+            self._limits[url] = max(1, min(current, span // 2))
+
+    def record_success(self, url, span):
+        """한도를 꽉 채운 범위가 성공하면 한도를 조금씩 늘려봄"""
+        with self._lock:
+            current = self._limits.get(url, LOG_RANGE_INITIAL)
+            if span >= current:
+                self._limits[url] = min(LOG_RANGE_MAX, int(current * LOG_RANGE_GROWTH) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._limits)
+
+@shared_resource
+def get_log_range_planner():
+    """프로세스 전역 엔드포인트별 로그 범위 한도"""
+    return LogRangePlanner()
+
+def get_logs_adaptive(rpc_urls, log_filter, from_block, to_block, max_workers=4):
+    """
+    [from_block, to_block] 범위의 로그를 엔드포인트별 한도로 나눠 여러 엔드포인트에서 동시에 조회
+
+    범위/결과 수 초과 에러가 나면 해당 구간을 반으로 나눠 다시 조회하고 엔드포인트 한도를 학습.
+    그 외 에러는 다음 엔드포인트로 넘겨 재시도하며, 모든 엔드포인트에서 실패한 구간이 있으면 예외 발생
+
+    Args:
+        log_filter: fromBlock/toBlock을 제외한 eth_getLogs 필터 (address, topics)
+
+    Returns:
+        list: 블록 순서로 정렬된 로그 목록
+    """
+    registry = get_endpoint_registry()
+    planner = get_log_range_planner()
+    endpoints = [url for url in registry.ranked(rpc_urls) if registry.is_healthy(url)] or registry.ranked(rpc_urls)
+
+    # 작업 단위: (시작 블록, 끝 블록, 엔드포인트 인덱스, 시도 횟수)
+    work = []
+    cursor = from_block
+    index = 0
+    while cursor <= to_block:
+        span = planner.limit(endpoints[index % len(endpoints)])
+        work.append((cursor, min(to_block, cursor + span - 1), index, 0))
+        cursor += span
+        index += 1
+
+    def fetch(start, end, endpoint_index):
+        rpc = endpoints[endpoint_index % len(endpoints)]
+        params = [dict(log_filter, fromBlock=hex(start), toBlock=hex(end))]
+        return rpc, rpc_request(rpc, "eth_getLogs", params, timeout=30)
+
+    logs = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def submit(item):
+            start, end, endpoint_index, tries = item
+            # 학습된 한도보다 큰 구간은 제출 전에 미리 분할
+            limit = planner.limit(endpoints[endpoint_index % len(endpoints)])
+            while end - start + 1 > limit:
+                pending[executor.submit(fetch, start, start + limit - 1, endpoint_index)] = (start, start + limit - 1, endpoint_index, tries)
+                start += limit
+            pending[executor.submit(fetch, start, end, endpoint_index)] = (start, end, endpoint_index, tries)
+
+        for item in work:
+            submit(item)
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                start, end, endpoint_index, tries = pending.pop(future)
+                rpc = endpoints[endpoint_index % len(endpoints)]
+                try:
+                    _, result = future.result()
+                except Exception as e:
+                    if is_log_range_error(e) and end > start:
+                        # 구간을 반으로 나눠 같은 엔드포인트에서 다시 조회
+                        planner.record_failure(rpc, end - start + 1)
+                        get_metrics().count_retry(url_host(rpc), "log_range")
+                        mid = (start + end) // 2
+                        submit((start, mid, endpoint_index, tries))
+                        submit((mid + 1, end, endpoint_index, tries))
+                    elif tries + 1 < len(endpoints):
+                        get_metrics().count_retry(url_host(rpc), "failover")
+                        submit((start, end, endpoint_index + 1, tries + 1))
+                    else:
+                        raise
+                    continue
+
+                planner.record_success(rpc, end - start + 1)
+                logs.extend(result or [])
+
+    logs.sort(key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)))
+    return logs
+
+def address_topic(address):
+    """주소를 32바이트 로그 토픽 형식으로 변환"""
+    return "0x" + "0" * 24 + address.lower()[2:]
+
+def get_block_timestamps(rpc_urls, block_numbers):
+    """여러 블록의 타임스탬프를 JSON-RPC 배치 한 번으로 조회 → {블록 번호: unix timestamp}"""
+    if not block_numbers:
+        return {}
+
+    calls = [("eth_getBlockByNumber", [hex(block), False]) for block in block_numbers]
+    for rpc in get_endpoint_registry().ranked(rpc_urls):
+        try:
+            results = json_rpc_batch(rpc, calls)
+        except Exception:
+            continue
+        return {
+            block: int(result["timestamp"], 16)
+            for block, result in zip(block_numbers, results)
+            if result and result.get("timestamp")
+        }
+    return {}
+
+def get_withdrawals_from_logs(rpc_urls, chain, wallets, token_contract, decimals=18, lookback_blocks=None, hedge=False,
+                              to_block=None):
+    """
+    토큰 컨트랙트의 Transfer 로그를 한 번에 조회해 모든 지갑의 최근 출금 정보 계산
+
+    topic1(from)에 전체 지갑 주소를 OR 조건으로 넣어 최근 lookback_blocks 범위를 스캔
+    (범위가 크면 get_logs_adaptive가 엔드포인트별 한도에 맞춰 분할, to_block을 주면 그 블록까지만 스캔)
+
+    Returns:
+        dict: {지갑 주소: get_last_withdrawal과 같은 형식의 출금 정보 또는 에러 dict}
+    """
+    lookback = lookback_blocks or LOG_LOOKBACK_BLOCKS.get(chain, DEFAULT_LOG_LOOKBACK_BLOCKS)
+
+    try:
+        latest_block = to_block if to_block is not None else int(hedged_rpc_request(rpc_urls, "eth_blockNumber", [], hedge=hedge), 16)
+        log_filter = {
+            "address": Web3.to_checksum_address(token_contract),
+            "topics": [TRANSFER_TOPIC, [address_topic(wallet) for wallet in wallets]]
+        }
+        # 엔드포인트별 범위 한도에 맞춰 나눠서 동시 조회
+        logs = get_logs_adaptive(rpc_urls, log_filter, max(0, latest_block - lookback), latest_block)
+    except Exception as e:
+        return {wallet: {"error": str(e)[:50], "wallet": wallet[:10]} for wallet in wallets}
+
+    # 지갑별 가장 최근 출금 로그 선택 (블록 번호, 로그 인덱스 기준)
+    latest_logs = {}
+    for log in logs:
+        topics = log.get("topics", [])
+        if len(topics) != 3:
+            # ERC721 등 indexed 값이 다른 Transfer 이벤트 제외
+            continue
+        sender = "0x" + topics[1][-40:]
+        position = (int(log["blockNumber"], 16), int(log["logIndex"], 16))
+        if sender not in latest_logs or position > latest_logs[sender][0]:
+            latest_logs[sender] = (position, log)
+
+    timestamps = get_block_timestamps(rpc_urls, sorted({position[0] for position, _ in latest_logs.values()}))
+
+    results = {}
+    for wallet in wallets:
+        entry = latest_logs.get(wallet.lower())
+        if entry is None:
+            results[wallet] = {"error": f"No OUT in {lookback} blocks", "wallet": wallet[:10]}
+            continue
+
+        (block_number, _), log = entry
+        raw_amount = int(log["data"], 16) if log.get("data") not in (None, "0x") else 0
+        results[wallet] = {
+            "amount": raw_amount / (10 ** decimals),
+            "to": "0x" + log["topics"][2][-40:],
+            "timestamp": timestamps.get(block_number, 0),
+            "tx_hash": log.get("transactionHash", "")
+        }
+
+    return results
+
+@market_cached("1inch", is_failure=lambda price: not price)
+def get_token_price_from_1inch(chain_id, contract_address):
+    """1inch API를 통해 토큰 가격을 조회하는 함수"""
+    chain_id_map = {
+        "ETH": 1,
+        "BSC": 56,
+        "ARB": 42161,
+        "OP": 10,
+        "BASE": 8453,
+        "AVAX": 43114,
+        "POL": 137
+    }
+
+    try:
+        url = f"{ONEINCH_API}/{chain_id_map.get(chain_id, 1)}/quote"
+
+        usdc_addresses = {
+            "ETH": "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48",
+            "BSC": "0x8ac76a51cc950d9822d68b83fe1ad97b32cd580d",
+            "ARB": "0xaf88d065e77c8cc2239327c5edb3a432268e5831",
+            "OP": "0x0b2c639c533813f4aa9d7837caf62653d097ff85",
+            "BASE": "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913",
+            "AVAX": "0xb97ef9ef8734c71904d8002f8b6bc66dd9c48a6e",
+            "POL": "0x2791bca1f2de4661ed88a30c99a7a9449aa84174"
+        }
+
+        params = {
+            "fromTokenAddress": contract_address,
+            "toTokenAddress": usdc_addresses.get(chain_id, usdc_addresses["ETH"]),
+            "amount": str(10**18)
+        }
+
+        headers = {"Accept": "application/json"}
+
+        res = http_get(url, params=params, headers=headers, timeout=10)
+
+        if res.status_code == 200:
+            data = res.json()
+            price = int(data.get("toTokenAmount", 0)) / 10**6
+            return price
+        else:
+            return 0
+
+    except Exception as e:
+        return 0
+
+@market_cached("coingecko", is_failure=lambda result: not result[0])
+def get_token_price(chain_key, contract_address, selected_chain=None):
+    """토큰 가격을 조회하는 함수 (CoinGecko 우선, 실패시 1inch)"""
+    price_source = "CoinGecko"
+
+    # 1. CoinGecko 시도
+    try:
+        url = f"{COINGECKO_API}/simple/token_price/{chain_key}"
+        params = {
+            "contract_addresses": contract_address.lower(),
+            "vs_currencies": "usd"
+        }
+        headers = {"Accept": "application/json"}
+        res = http_get(url, params=params, headers=headers, timeout=10)
+
+        if res.status_code == 200:
+            data = res.json()
+            price = data.get(contract_address.lower(), {}).get("usd", 0)
+            if price > 0:
+                return price, price_source
+
+    except Exception as e:
+        pass
+
+    # 2. CoinGecko 실패시 1inch API 시도
+    if selected_chain:
+        price = get_token_price_from_1inch(selected_chain, contract_address)
+        if price > 0:
+            price_source = "1inch (DEX)"
+            return price, price_source
+
+    return 0, "없음"
+
+@market_cached("coingecko", is_failure=lambda result: result["source"] == "없음")
+def get_token_market_data(chain_key, contract_address):
+    """
+    CoinGecko에서 토큰의 시가총액, 24시간 거래량, FDV 등 시장 데이터 조회
+
+    Returns:
+        dict: {
+            "price": 현재가,
+            "market_cap": 시가총액,
+            "fdv": 완전희석가치,
+            "volume_24h": 24시간 거래량,
+            "price_change_24h": 24시간 가격 변동률,
+            "circulating_supply": 유통량,
+            "total_supply": 총 발행량,
+            "source": 데이터 출처
+        }
+    """
+    result = {
+        "price": 0,
+        "market_cap": 0,
+        "fdv": 0,
+        "volume_24h": 0,
+        "price_change_24h": 0,
+        "circulating_supply": 0,
+        "total_supply": 0,
+        "source": "없음"
+    }
+
+    try:
+        # CoinGecko token info API (더 상세한 정보)
+        url = f"{COINGECKO_API}/coins/{chain_key}/contract/{contract_address.lower()}"
+        headers = {"Accept": "application/json"}
+        res = http_get(url, headers=headers, timeout=15)
+
+        if res.status_code == 200:
+            data = res.json()
+            market_data = data.get("market_data", {})
+
+            result["price"] = market_data.get("current_price", {}).get("usd", 0)
+            result["market_cap"] = market_data.get("market_cap", {}).get("usd", 0)
+            result["fdv"] = market_data.get("fully_diluted_valuation", {}).get("usd", 0)
+            result["volume_24h"] = market_data.get("total_volume", {}).get("usd", 0)
+            result["price_change_24h"] = market_data.get("price_change_percentage_24h", 0)
+            result["circulating_supply"] = market_data.get("circulating_supply", 0)
+            result["total_supply"] = market_data.get("total_supply", 0)
+            result["source"] = "CoinGecko"
+
+            return result
+
+    except Exception as e:
+        pass
+
+    # 상세 API 실패시 기본 price API로 가격만이라도 가져오기
+    try:
+        url = f"{COINGECKO_API}/simple/token_price/{chain_key}"
+        params = {
+            "contract_addresses": contract_address.lower(),
+            "vs_currencies": "usd",
+            "include_market_cap": "true",
+            "include_24hr_vol": "true",
+            "include_24hr_change": "true"
+        }
+        headers = {"Accept": "application/json"}
+        res = http_get(url, params=params, headers=headers, timeout=10)
+
+        if res.status_code == 200:
+            data = res.json()
+            token_data = data.get(contract_address.lower(), {})
+
+            result["price"] = token_data.get("usd", 0)
+            result["market_cap"] = token_data.get("usd_market_cap", 0)
+            result["volume_24h"] = token_data.get("usd_24h_vol", 0)
+            result["price_change_24h"] = token_data.get("usd_24h_change", 0)
+            result["source"] = "CoinGecko (Simple)"
+
+    except Exception as e:
+        pass
+
+    return result
+
+def format_large_number(num):
+    """큰 숫자를 K, M, B 단위로 포맷팅"""
+    if num is None or num == 0:
+        return "-"
+    if num >= 1_000_000_000:
+        return f"${num/1_000_000_000:.2f}B"
+    elif num >= 1_000_000:
+        return f"${num/1_000_000:.2f}M"
+    elif num >= 1_000:
+        return f"${num/1_000:.2f}K"
+    else:
+        return f"${num:.2f}"
+
+# ============================================================
+# 잔고 히스토리 (수집할 때마다 지갑별 잔고를 SQLite에 누적)
+# ============================================================
+# 히스토리 보관 기간 (초)
+BALANCE_HISTORY_RETENTION = 30 * 86400
+# 오래된 히스토리 정리 주기 (초)
+BALANCE_HISTORY_PRUNE_INTERVAL = 3600
+
+class BalanceHistoryStore:
+    """(체인, 토큰, 지갑, 블록, 시각)별 잔고를 SQLite에 추가만 하는 시계열 저장소 (첫 사용 시 연결)"""
+
+    def __init__(self, path, retention=BALANCE_HISTORY_RETENTION):
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = None
+        self._last_pruned = 0.0
+
+    def _connect(self):
+        """DB 연결 (lock 보유 상태에서 호출, 디스크를 쓸 수 없으면 히스토리 없이 동작)"""
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS balances ("
+                    "chain TEXT NOT NULL, token TEXT NOT NULL, wallet TEXT NOT NULL, "
+                    "block INTEGER, ts REAL NOT NULL, balance REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_balances_token_ts ON balances (chain, token, ts)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_balances_wallet_ts ON balances (chain, token, wallet, ts)")
+                conn.commit()
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                self._conn = False
+        return self._conn or None
+
+    def append(self, chain, token_contract, balances, ts=None, block=None):
+        """
+        한 번의 수집 결과를 한 트랜잭션으로 추가
+
+        Args:
+            balances: {지갑 주소: 잔고}
+        """
+        if not balances:
+            return
+        ts = ts or time.time()
+        token = token_contract.lower()
+        rows = [(chain, token, wallet.lower(), block, ts, float(balance)) for wallet, balance in balances.items()]
+        with self._lock:
+            conn = self._connect()
+            if not conn:
+                return
+            try:
+                conn.executemany(
+                    "INSERT INTO balances (chain, token, wallet, block, ts, balance) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                if ts - self._last_pruned > BALANCE_HISTORY_PRUNE_INTERVAL:
+                    conn.execute("DELETE FROM balances WHERE ts < ?", (ts - self.retention,))
+                    self._last_pruned = ts
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def query(self, chain, token_contract, start_ts, end_ts=None, bucket_seconds=None):
+        """
+        기간 내 지갑별 잔고 조회 (bucket_seconds를 주면 구간별 마지막 값으로 다운샘플링)
+
+        Returns:
+            pd.DataFrame: columns [wallet, ts, block, balance] (ts 오름차순)
+        """
+        end_ts = end_ts or time.time()
+        params = (chain, token_contract.lower(), start_ts, end_ts)
+        if bucket_seconds:
+            # SQLite는 MAX()와 함께 쓴 나머지 컬럼을 MAX 행의 값으로 채움 → 구간별 마지막 잔고
+            sql = (
+                "SELECT wallet, MAX(ts) AS ts, block, balance FROM balances "
+                "WHERE chain = ? AND token = ? AND ts >= ? AND ts <= ? "
+                "GROUP BY wallet, CAST(ts / ? AS INTEGER) ORDER BY ts"
+            )
+            params += (bucket_seconds,)
+        else:
+            sql = (
+                "SELECT wallet, ts, block, balance FROM balances "
+                "WHERE chain = ? AND token = ? AND ts >= ? AND ts <= ? ORDER BY ts"
+            )
+
+        with self._lock:
+            conn = self._connect()
+            if not conn:
+                return pd.DataFrame(columns=["wallet", "ts", "block", "balance"])
+            try:
+                rows = conn.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                rows = []
+        return pd.DataFrame(rows, columns=["wallet", "ts", "block", "balance"])
+
+@shared_resource
+def get_balance_history_store():
+    """프로세스 전역 잔고 히스토리 저장소"""
+    return BalanceHistoryStore(os.path.join(CACHE_DIR, "balance_history.sqlite3"))
+
+def balance_history_frame(history, wallets):
+    """
+    히스토리 조회 결과를 차트용 표로 변환 (행: 시각, 열: 지갑 이름)
+
+    Args:
+        wallets: {지갑 이름: 지갑 주소}
+    """
+    if history.empty:
+        return pd.DataFrame()
+    names = {addr.lower(): name for name, addr in wallets.items()}
+    history = history[history["wallet"].isin(names)]
+    frame = history.assign(
+        time=pd.to_datetime(history["ts"], unit="s"),
+        name=history["wallet"].map(names)
+    ).pivot_table(index="time", columns="name", values="balance", aggfunc="last")
+    return frame.ffill()
+
+# ============================================================
+# 블록 고정 스냅샷 ((체인, 블록, 토큰, 지갑)별 잔고 캐시)
+# ============================================================
+# 엔드포인트마다 최신 블록이 조금씩 다르므로 latest보다 이만큼 이전 블록에 고정
+# (뒤처진 엔드포인트가 고정 블록을 모르는 경우 방지)
+SNAPSHOT_BLOCK_LAG = 2
+# 블록별 잔고 캐시 최대 항목 수
+BALANCE_CACHE_MAX_ENTRIES = 50000
+
+class BalanceCache:
+    """(체인, 블록, 토큰, 지갑)별 잔고 캐시 (LRU, 스레드/세션 간 공유)"""
+
+    def __init__(self, max_entries=BALANCE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chain, block_number, token_contract, wallet):
+        key = (chain, block_number, token_contract.lower(), wallet.lower())
+        with self._lock:
+            balance = self._entries.get(key)
+            if balance is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return balance
+
+    def put(self, chain, block_number, token_contract, wallet, balance):
+        key = (chain, block_number, token_contract.lower(), wallet.lower())
+        with self._lock:
+            self._entries[key] = balance
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+@shared_resource
+def get_balance_cache():
+    """프로세스 전역 블록별 잔고 캐시"""
+    return BalanceCache()
+
+def resolve_snapshot_block(rpc_urls, hedge=False):
+    """
+    이번 수집에서 모든 잔고 조회를 고정할 블록 번호
+
+    Returns:
+        int: 블록 번호 또는 None (조회 실패 → latest로 조회)
+    """
+    try:
+        latest_block = int(hedged_rpc_request(rpc_urls, "eth_blockNumber", [], timeout=10, hedge=hedge), 16)
+    except Exception:
+        return None
+    return max(0, latest_block - SNAPSHOT_BLOCK_LAG)
+
+# ============================================================
+# asyncio 통합 조회 엔진 (독립적인 조회를 한 번에 스케줄링)
+# ============================================================
+# 호스트별 기본 동시 실행 수
+ENGINE_HOST_CONCURRENCY = 8
+# 엔진이 블로킹 조회를 실행할 스레드 수
+ENGINE_THREADS = 32
+
+def get_chain_balances(rpc_urls, chain, wallets, token_contract, decimals=18, hedge=False, max_workers=4, block_number=None):
+    """
+    체인의 모든 지갑 잔고 조회 (Multicall3 → JSON-RPC 배치 → 지갑별 병렬 조회 순서로 폴백)
+
+    block_number를 주면 모든 balanceOf를 그 블록에 고정해서 한 시점의 일관된 스냅샷을 만들고,
+    같은 블록에서 이미 조회한 지갑은 RPC 없이 캐시에서 반환
+
+    Args:
+        wallets: {지갑 이름: 지갑 주소}
+
+    Returns:
+        dict: {지갑 주소: 잔고} (모든 방식으로 조회에 실패한 지갑은 제외)
+    """
+    block_identifier = hex(block_number) if block_number is not None else "latest"
+    cache = get_balance_cache() if block_number is not None else None
+
+    balances = {}
+    if cache:
+        for addr in wallets.values():
+            cached = cache.get(chain, block_number, token_contract, addr)
+            if cached is not None:
+                balances[addr] = cached
+
+    # 1단계: Multicall3로 전체 지갑 잔고를 한 번에 조회
+    pending_wallets = {name: addr for name, addr in wallets.items() if addr not in balances}
+    if pending_wallets:
+        balances.update(get_token_balances_multicall(
+            rpc_urls, list(pending_wallets.values()), token_contract, decimals, hedge=hedge, block_identifier=block_identifier
+        ) or {})
+
+    # Multicall로 가져오지 못한 지갑은 JSON-RPC 배치 한 번으로 재조회
+    pending_wallets = {name: addr for name, addr in wallets.items() if addr not in balances}
+    if pending_wallets:
+        batch_result = get_token_balances_batch(
+            rpc_urls, list(pending_wallets.values()), token_contract, decimals, block_identifier=block_identifier
+        )
+        if batch_result:
+            balances.update(batch_result["balances"])
+
+    # 배치로도 가져오지 못한 지갑만 개별 병렬 조회 (web3 call()은 블록 번호를 int로 받음)
+    pending_wallets = {name: addr for name, addr in wallets.items() if addr not in balances}
+    if pending_wallets:
+        call_block = block_number if block_number is not None else "latest"
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_wallet = {
+                executor.submit(get_token_balance_rpc, rpc_urls, addr, token_contract, name, chain, call_block, decimals): addr
+                for name, addr in pending_wallets.items()
+            }
+            try:
+                for future in as_completed(future_to_wallet, timeout=60):
+                    addr = future_to_wallet[future]
+                    try:
+                        balance = future.result()["balance"]
+                    except Exception:
+                        continue
+                    # 모든 RPC에서 실패한 지갑은 결과와 캐시에서 모두 제외
+                    if balance is not None:
+                        balances[addr] = balance
+            except Exception:
+                pass
+
+    # 블록이 고정된 결과만 캐시 (조회에 성공한 지갑만 balances에 있음)
+    if cache:
+        for addr, balance in balances.items():
+            cache.put(chain, block_number, token_contract, addr, balance)
+
+    return balances
+
+def get_market_snapshot(cg_key, token_contract, chain):
+    """
+    시장 데이터 조회 (CoinGecko 상세 → 가격만 조회 폴백)
+
+    Returns:
+        dict: {"market_data": get_token_market_data 결과, "price": 가격, "price_source": 가격 출처}
+    """
+    market_data = get_token_market_data(cg_key, token_contract)
+    if market_data["price"] > 0:
+        return {"market_data": market_data, "price": market_data["price"], "price_source": market_data["source"]}
+
+    price, price_source = get_token_price(cg_key, token_contract, chain)
+    return {"market_data": market_data, "price": price, "price_source": price_source}
+
+def url_host(url):
+    """URL의 호스트 (호스트별 동시 실행 제한 키)"""
+    from urllib.parse import urlparse
+
+    return urlparse(url).netloc
+
+def get_explorer_host(chain):
+    """체인의 Explorer API 호스트"""
+    return url_host(AVAX_API_URL if chain == "AVAX" else ETHERSCAN_V2_API)
+
+class HostConcurrencyLimiter:
+    """호스트별 asyncio 세마포어 (이벤트 루프 안에서 생성/사용)"""
+
+    def __init__(self, default_limit=ENGINE_HOST_CONCURRENCY, limits=None):
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self._semaphores = {}
+
+    def __call__(self, host):
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.limits.get(host, self.default_limit))
+        return semaphore
+
+async def fetch_dashboard_data(chain, token_contract, wallets, include_dex=False, withdrawal_source="Explorer API",
+                               lookback_blocks=None, hedge=False, max_workers=4, withdrawals_timeout=None):
+    """
+    토큰 정보/시장 데이터/잔고/출금/DEX 풀을 동시에 조회해서 하나의 결과로 반환
+
+    시장 데이터와 DEX 풀은 바로 시작하고, 잔고와 출금은 decimals가 필요하므로 토큰 정보(대부분 캐시)만 기다린 뒤 시작.
+    블로킹 조회는 전용 스레드 풀에서 실행되며 호스트별 동시 실행 수가 제한됨
+
+    Args:
+        wallets: {지갑 이름: 지갑 주소}
+        withdrawals_timeout: 출금 조회에 허용하는 최대 시간 (초, None이면 제한 없음).
+            초과하면 출금만 지갑별 에러로 채우고 잔고/시장 데이터는 그대로 반환
+
+    Returns:
+        dict: {
+            "token_info", "block" (잔고를 고정한 블록 번호, 실패시 None), "market" (get_market_snapshot 결과),
+            "balances", "withdrawals", "withdrawals_error" (출금 조회 시간 초과시 메시지, 아니면 None),
+            "dex_pairs", "timings" (단계별 소요시간, 초)
+        }
+    """
+    rpc_urls = RPC_URLS.get(chain)
+    cg_key = COINGECKO_CHAIN_MAP.get(chain, "ethereum")
+    explorer_host = get_explorer_host(chain)
+    rpc_host = f"rpc:{chain}"
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=ENGINE_THREADS, thread_name_prefix="fetch-engine")
+    host_limiter = HostConcurrencyLimiter(limits={explorer_host: max_workers})
+    timings = {}
+    started = time.monotonic()
+
+    async def run(host, func, *args, **kwargs):
+        async with host_limiter(host):
+            return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    async def timed(phase, coro):
+        phase_started = time.monotonic()
+        try:
+            return await coro
+        finally:
+            timings[phase] = time.monotonic() - phase_started
+            get_metrics().observe_phase(chain, phase, timings[phase])
+
+    async def load_balances():
+        token_info = await token_task
+        block_number = await block_task
+        return await run(rpc_host, get_chain_balances, rpc_urls, chain, wallets, token_contract,
+                         token_info["decimals"], hedge=hedge, max_workers=max_workers, block_number=block_number)
+
+    async def load_withdrawals():
+        token_info = await token_task
+        decimals = token_info["decimals"]
+        if withdrawal_source == "RPC 로그 스캔":
+            block_number = await block_task
+            return await run(rpc_host, get_withdrawals_from_logs, rpc_urls, chain, list(wallets.values()),
+                             token_contract, decimals, lookback_blocks=lookback_blocks, hedge=hedge, to_block=block_number)
+
+        addresses = list(wallets.values())
+        results = await asyncio.gather(
+            *(run(explorer_host, get_last_withdrawal, chain, addr, token_contract, decimals) for addr in addresses),
+            return_exceptions=True
+        )
+        return {
+            addr: {"error": str(result)[:50], "wallet": addr[:10]} if isinstance(result, Exception) else result
+            for addr, result in zip(addresses, results)
+        }
+
+    async def load_withdrawals_within_timeout():
+        if withdrawals_timeout is None:
+            return await load_withdrawals(), None
+        try:
+            return await asyncio.wait_for(load_withdrawals(), withdrawals_timeout), None
+        except asyncio.TimeoutError:
+            # 아직 시작하지 않은 Explorer 요청은 취소되고, 잔고/시장 데이터 결과는 유지
+            error = f"{withdrawals_timeout}초 내 응답 없음"
+            return {addr: {"error": error, "wallet": addr[:10]} for addr in wallets.values()}, error
+
+    async def load_dex():
+        if not include_dex:
+            return []
+        return await run(url_host(DEXSCREENER_API), get_dexscreener_data, chain, token_contract)
+
+    try:
+        token_task = asyncio.ensure_future(timed("token_info", run(rpc_host, fetch_token_info, rpc_urls, token_contract, chain, hedge=hedge)))
+        # 잔고/로그 조회를 모두 같은 블록에 고정 (한 시점의 일관된 스냅샷)
+        block_task = asyncio.ensure_future(timed("block", run(rpc_host, resolve_snapshot_block, rpc_urls, hedge=hedge)))
+        market_task = asyncio.ensure_future(timed("market", run(url_host(COINGECKO_API), get_market_snapshot, cg_key, token_contract, chain)))
+        balances_task = asyncio.ensure_future(timed("balances", load_balances()))
+        withdrawals_task = asyncio.ensure_future(timed("withdrawals", load_withdrawals_within_timeout()))
+        dex_task = asyncio.ensure_future(timed("dex", load_dex()))
+
+        token_info, block_number, market, balances, (withdrawals, withdrawals_error), dex_pairs = await asyncio.gather(
+            token_task, block_task, market_task, balances_task, withdrawals_task, dex_task
+        )
+    finally:
+        executor.shutdown(wait=False)
+
+    timings["total"] = time.monotonic() - started
+    get_metrics().observe_phase(chain, "total", timings["total"])
+
+    # 수집할 때마다 잔고 히스토리에 누적 (차트/증감 계산용)
+    # 조회에 성공한 잔고만 들어 있고, 스냅샷 블록조차 못 구한 수집(RPC 전체 실패)은 기록하지 않음
+    if block_number is not None:
+        get_balance_history_store().append(chain, token_contract, balances, block=block_number)
+
+    return {
+        "token_info": token_info,
+        "block": block_number,
+        "market": market,
+        "balances": balances,
+        "withdrawals": withdrawals,
+        "withdrawals_error": withdrawals_error,
+        "dex_pairs": dex_pairs,
+        "timings": timings
+    }
+
+# ============================================================
+# 백그라운드 수집기 (탭/세션 수와 무관하게 추적 대상별로 한 번만 수집)
+# ============================================================
+# 추적 대상별 수집 주기 (초)
+COLLECTOR_INTERVAL = 180
+# 이 시간 동안 아무도 보지 않은 추적 대상은 수집 중단 (초)
+COLLECTOR_IDLE_TIMEOUT = 1800
+# 동시에 수집할 수 있는 추적 대상 수
+COLLECTOR_WORKERS = 4
+# 스냅샷이 아직 없을 때 화면에서 첫 수집을 기다리는 최대 시간 (초)
+COLLECTOR_FIRST_WAIT = 120
+
+def run_async(coro_func, *args, **kwargs):
+    """코루틴 함수를 새 이벤트 루프에서 실행 (수집기 스레드에서 async 엔진 호출용)"""
+    return asyncio.run(coro_func(*args, **kwargs))
+
+class SnapshotCollector:
+    """
+    추적 대상(체인, 토큰 등)을 주기적으로 수집해서 최신 스냅샷을 공유 (스레드/세션 간 공유)
+
+    화면은 track()으로 보고 있는 대상을 등록하고 latest()로 스냅샷만 읽음.
+    수집은 백그라운드 스레드가 대상별로 COLLECTOR_INTERVAL마다 한 번만 실행
+    """
+
+    def __init__(self, interval=COLLECTOR_INTERVAL, idle_timeout=COLLECTOR_IDLE_TIMEOUT, max_workers=COLLECTOR_WORKERS):
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._targets = {}
+        self._snapshots = {}
+        self._running = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot-collector")
+        self._scheduler = None
+
+    def track(self, key, fetch):
+        """
+        추적 대상 등록/갱신 (화면을 그릴 때마다 호출)
+
+        Args:
+            key: 추적 대상 키 (해시 가능한 값)
+            fetch: 인자 없이 호출하면 수집 결과를 반환하는 함수
+        """
+        with self._cond:
+            target = self._targets.get(key)
+            if target is None:
+                target = self._targets[key] = {"due": 0.0, "rerun": False}
+            target["fetch"] = fetch
+            target["last_seen"] = time.time()
+            self._ensure_scheduler()
+            self._cond.notify_all()
+
+    def request_refresh(self, key):
+        """다음 주기를 기다리지 않고 바로 다시 수집 (수집 중이면 끝난 직후 한 번 더)"""
+        with self._cond:
+            target = self._targets.get(key)
+            if target is None:
+                return
+            if key in self._running:
+                target["rerun"] = True
+            else:
+                target["due"] = 0.0
+            self._cond.notify_all()
+
+    def latest(self, key, wait=0, newer_than=0):
+        """
+        최신 스냅샷 반환 (없으면 wait초까지 기다림)
+
+        Args:
+            newer_than: 이 시각 이후에 시작된 수집 결과만 인정 (수동 새로고침용)
+
+        Returns:
+            dict: {"data", "error", "started_at", "updated_at", "duration"} 또는 None
+        """
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while True:
+                snapshot = self._snapshots.get(key)
+                if snapshot and snapshot["started_at"] >= newer_than:
+                    return snapshot
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return snapshot if not newer_than else None
+                self._cond.wait(remaining)
+
+    def tracked(self):
+        """추적 중인 대상 키와 마지막 수집 시각 (디버깅용)"""
+        with self._cond:
+            return {key: self._snapshots.get(key, {}).get("updated_at") for key in self._targets}
+
+    def _ensure_scheduler(self):
+        """스케줄러 스레드 시작 (lock 보유 상태에서 호출)"""
+        if self._scheduler is not None and self._scheduler.is_alive():
+            return
+        self._scheduler = threading.Thread(target=self._schedule_loop, name="snapshot-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def _schedule_loop(self):
+        with self._cond:
+            while True:
+                now = time.time()
+                for key in [k for k, t in self._targets.items() if now - t["last_seen"] > self.idle_timeout]:
+                    del self._targets[key]
+                    self._snapshots.pop(key, None)
+
+                for key, target in self._targets.items():
+                    if key not in self._running and target["due"] <= now:
+                        self._running.add(key)
+                        self._executor.submit(self._collect, key, target["fetch"])
+
+                next_due = min(
+                    (t["due"] for k, t in self._targets.items() if k not in self._running),
+                    default=now + self.interval
+                )
+                self._cond.wait(max(0.1, next_due - now))
+
+    def _collect(self, key, fetch):
+        started_at = time.time()
+        started = time.monotonic()
+        data, error = None, None
+        try:
+            data = fetch()
+        except Exception as e:
+            error = str(e)[:200]
+        duration = time.monotonic() - started
+
+        # 새로고침 소요시간 기록 (전체 세션 공유)
+        get_refresh_durations().append(duration)
+
+        with self._cond:
+            self._running.discard(key)
+            target = self._targets.get(key)
+            if target is None:
+                # 수집 중에 유휴 정리된 대상은 스냅샷을 저장하지 않음 (되살아난 스냅샷이 남지 않도록)
+                self._cond.notify_all()
+                return
+            previous = self._snapshots.get(key)
+            if data is None and previous and previous["data"] is not None:
+                # 실패하면 이전 데이터를 유지하고 에러만 표시
+                data = previous["data"]
+            self._snapshots[key] = {
+                "data": data,
+                "error": error,
+                "started_at": started_at,
+                "updated_at": time.time(),
+                "duration": duration
+            }
+            target["due"] = 0.0 if target["rerun"] else time.time() + self.interval
+            target["rerun"] = False
+            self._cond.notify_all()
+
+@shared_resource
+def get_snapshot_collector():
+    """프로세스 전역 백그라운드 수집기"""
+    return SnapshotCollector()
+
+# ============================================================
+# 크로스체인 합산 (체인별 엔진을 동시에 실행하고 거래소별로 합산)
+# ============================================================
+# 체인별 최근출금 조회에 허용하는 최대 시간 (초) - 느린 Explorer가 잔고/시장 데이터까지 버리게 하지 않도록
+CROSS_CHAIN_WITHDRAWALS_TIMEOUT = 60
+# 체인 하나에 허용하는 최대 조회 시간 (초) - 잔고 RPC까지 응답하지 않는 체인이 다른 체인 결과를 막지 않도록
+CROSS_CHAIN_TIMEOUT = 120
+
+async def fetch_cross_chain_data(contracts, hedge=False, max_workers=4, timeout=CROSS_CHAIN_TIMEOUT,
+                                 withdrawals_timeout=CROSS_CHAIN_WITHDRAWALS_TIMEOUT):
+    """
+    여러 체인의 같은 토큰을 동시에 조회 (체인별로 fetch_dashboard_data 실행)
+
+    체인마다 별도 스레드 풀/호스트 제한을 쓰고 타임아웃과 에러도 체인별로 처리되므로,
+    한 체인의 느리거나 죽은 RPC가 다른 체인 결과에 영향을 주지 않음.
+    최근출금은 Explorer API 키가 있는 체인은 Explorer API, 없는 체인은 RPC 로그 스캔으로 조회.
+    Etherscan V2 체인들은 같은 호스트/키의 토큰 버킷을 나눠 쓰므로 (키 단위 한도라 체인별로 나눌 수 없음)
+    출금 조회에만 withdrawals_timeout을 걸어, Explorer가 밀려도 잔고/시장 데이터는 그대로 표시
+
+    Args:
+        contracts: {체인: 토큰 컨트랙트 주소}
+
+    Returns:
+        dict: {체인: fetch_dashboard_data 결과 또는 {"error": 에러 메시지}}
+    """
+    async def load_chain(chain, token_contract):
+        withdrawal_source = "Explorer API" if get_explorer_api_key(chain) else "RPC 로그 스캔"
+        try:
+            return await asyncio.wait_for(
+                fetch_dashboard_data(chain, token_contract, get_chain_info()[chain]["wallets"],
+                                     withdrawal_source=withdrawal_source, hedge=hedge, max_workers=max_workers,
+                                     withdrawals_timeout=withdrawals_timeout),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            return {"error": f"{timeout}초 내 응답 없음"}
+        except Exception as e:
+            return {"error": str(e)[:100]}
+
+    chains = list(contracts.keys())
+    results = await asyncio.gather(*(load_chain(chain, contracts[chain]) for chain in chains))
+    return dict(zip(chains, results))
+
+def build_cross_chain_tables(cross_chain_data):
+    """
+    체인별 조회 결과를 지갑 단위 표와 거래소별 합산 표로 변환 (실패한 체인은 제외)
+
+    Returns:
+        tuple: (wallet_df, exchange_df)
+            wallet_df: 체인/거래소/지갑이름/주소/잔고/달러환산/출금타임스탬프
+            exchange_df: 거래소별 체인 잔고 열 + 총 잔고/달러환산/지갑 수/최근출금
+    """
+    # 레지스트리의 거래소 인덱스로 지갑을 거래소별로 모음 (같은 체인의 중복 주소는 이미 하나로 합쳐져 있음)
+    registry = get_wallet_registry()
+    rows = []
+    for exchange, keys in registry.by_exchange.items():
+        for chain, addr in keys:
+            data = cross_chain_data.get(chain)
+            if data is None or "error" in data:
+                continue
+            token_price = data["market"]["price"]
+            # 조회에 실패한 지갑은 0이 아니라 NaN (합계에서 제외)
+            balance = data["balances"].get(addr, np.nan)
+            last_wd = data["withdrawals"].get(addr) or {}
+            rows.append({
+                "체인": chain,
+                "거래소": exchange,
+                "지갑이름": registry.labels[(chain, addr)][0],
+                "주소": addr,
+                "잔고": balance,
+                "달러환산": balance * token_price if token_price > 0 else 0.0,
+                "출금타임스탬프": last_wd.get("timestamp", 0) if "error" not in last_wd else 0
+            })
+
+    wallet_df = pd.DataFrame(rows, columns=["체인", "거래소", "지갑이름", "주소", "잔고", "달러환산", "출금타임스탬프"])
+    if wallet_df.empty:
+        return wallet_df, pd.DataFrame()
+
+    chain_order = [chain for chain in cross_chain_data if chain in set(wallet_df["체인"])]
+    exchange_df = wallet_df.pivot_table(index="거래소", columns="체인", values="잔고", aggfunc="sum", fill_value=0)
+    exchange_df = exchange_df.reindex(columns=chain_order, fill_value=0)
+    grouped = wallet_df.groupby("거래소")
+    exchange_df["총 잔고"] = grouped["잔고"].sum()
+    exchange_df["달러환산"] = grouped["달러환산"].sum()
+    exchange_df["지갑 수"] = grouped.size()
+    exchange_df["출금타임스탬프"] = grouped["출금타임스탬프"].max()
+    exchange_df = exchange_df.sort_values("총 잔고", ascending=False).reset_index()
+    exchange_df.columns.name = None
+    return wallet_df, exchange_df
+
+# 단일 토큰 표의 열 순서
+WALLET_TABLE_COLUMNS = ["지갑이름", "주소", "잔고", "달러환산", "최근출금", "출금수량", "출금대상", "출금타임스탬프", "출금오류", "탐색기", "타입"]
+
+def short_address(address):
+    """표시용 축약 주소 (0x12345678...abcdef)"""
+    return address[:10] + "..." + address[-6:] if address else "N/A"
+
+def build_wallet_table(chain, token_contract, data, include_dex=False):
+    """
+    fetch_dashboard_data 결과를 지갑별 표로 변환 (CEX 지갑 + 선택시 DEX 풀)
+
+    숫자 열은 float/int 그대로 두고 문자열 포맷은 화면의 column_config에서만 적용하므로,
+    정렬과 CEX/DEX 합계를 문자열 파싱 없이 벡터 연산으로 처리할 수 있음
+
+    Returns:
+        DataFrame: 잔고/달러환산/최근출금(달러 환산, 가격이 없으면 NaN)/출금수량 (float),
+                   출금타임스탬프 (int, 출금 정보가 없으면 0), 지갑이름/주소/출금대상/출금오류/탐색기/타입 (CEX/DEX)
+    """
+    price = data["market"]["price"]
+    explorer = get_chain_info()[chain]["explorer"]
+    wallets = get_chain_info()[chain]["wallets"]
+    addresses = list(wallets.values())
+    withdrawals = [data["withdrawals"].get(addr) or {} for addr in addresses]
+    found = [bool(wd) and "error" not in wd for wd in withdrawals]
+
+    frames = [pd.DataFrame({
+        "지갑이름": list(wallets.keys()),
+        "주소": [short_address(addr) for addr in addresses],
+        # 조회에 실패한 지갑은 NaN (정렬시 맨 뒤, 합계에서 제외)
+        "잔고": np.array([data["balances"].get(addr, np.nan) for addr in addresses], dtype=float),
+        "출금수량": np.array([wd["amount"] if ok else np.nan for wd, ok in zip(withdrawals, found)], dtype=float),
+        "출금대상": [wd["to"][:10] + "..." if ok and wd["to"] else None for wd, ok in zip(withdrawals, found)],
+        "출금타임스탬프": np.array([wd["timestamp"] if ok else 0 for wd, ok in zip(withdrawals, found)], dtype=np.int64),
+        "출금오류": [wd["error"] if "error" in wd else None for wd in withdrawals],
+        "탐색기": [f"{explorer}/token/{token_contract}?a={addr}" for addr in addresses],
+        "타입": "CEX"
+    })]
+    frames[0]["달러환산"] = frames[0]["잔고"] * price if price > 0 else 0.0
+
+    liquidity = pd.DataFrame(format_liquidity_info(data["dex_pairs"])) if include_dex and data["dex_pairs"] else pd.DataFrame()
+    if not liquidity.empty:
+        liquidity_usd = liquidity["liquidity_usd"].to_numpy(dtype=float)
+        price_usd = liquidity["price_usd"].to_numpy(dtype=float)
+        frames.append(pd.DataFrame({
+            "지갑이름": liquidity["name"],
+            "주소": liquidity["address"].map(short_address),
+            # 풀 유동성(달러)을 토큰 가격으로 나눈 토큰 수량
+            "잔고": np.divide(liquidity_usd, price_usd, out=np.zeros_like(liquidity_usd), where=price_usd > 0),
+            "달러환산": liquidity_usd,
+            "출금수량": np.nan,
+            "출금타임스탬프": 0,
+            "탐색기": [f"{explorer}/address/{addr}" if addr else None for addr in liquidity["address"]],
+            "타입": "DEX"
+        }))
+
+    table = pd.concat(frames, ignore_index=True)
+    table["최근출금"] = table["출금수량"] * price if price > 0 else np.nan
+    table["출금타임스탬프"] = table["출금타임스탬프"].astype("int64")
+    return table.reindex(columns=WALLET_TABLE_COLUMNS)
+
+# import 소요시간 (무거운 의존성은 아직 import되지 않은 상태)
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+# ============================================================
+# CLI (대시보드 없이 조회 결과를 JSON으로 출력)
+# ============================================================
+def summarize_dashboard_data(chain, token_contract, data):
+    """fetch_dashboard_data 결과를 JSON으로 쓸 수 있는 지갑 목록 형태로 변환"""
+    price = data["market"]["price"]
+    wallets = []
+    for name, addr in get_chain_info()[chain]["wallets"].items():
+        balance = data["balances"].get(addr)
+        last_wd = data["withdrawals"].get(addr) or {}
+        wallets.append({
+            "name": name,
+            "address": addr,
+            "balance": balance,
+            "usd": balance * price if balance is not None and price > 0 else None,
+            "last_withdrawal": None if "error" in last_wd else last_wd or None
+        })
+    return {
+        "chain": chain,
+        "token": token_contract,
+        "token_info": data["token_info"],
+        "block": data["block"],
+        "price": price,
+        "price_source": data["market"]["price_source"],
+        "market": data["market"]["market_data"],
+        "wallets": wallets,
+        "dex_pairs": data["dex_pairs"],
+        "timings": data["timings"]
+    }
+
+def main(argv=None):
+    """CLI 진입점: python hotwallet_core.py --chain ETH --token 0x... [-o result.json]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="체인별 핫월렛 토큰 잔고/최근출금 조회 (JSON 출력)")
+    parser.add_argument("--chain", help="체인 (ETH, BSC, ARB, OP, BASE, AVAX, POL)")
+    parser.add_argument("--token", help="토큰 컨트랙트 주소")
+    parser.add_argument("--cross-chain", metavar="PRESET 또는 체인:주소,...",
+                        help=f"여러 체인 합산 조회 (프리셋: {', '.join(CROSS_CHAIN_PRESETS)})")
+    parser.add_argument("--watchlist", nargs="+", metavar="0x주소", help="--chain의 여러 토큰 잔고 행렬 조회")
+    parser.add_argument("--withdrawals", choices=["explorer", "logs"],
+                        help="최근출금 조회 방식 (기본: API 키가 있으면 explorer, 없으면 logs)")
+    parser.add_argument("--lookback-blocks", type=int, help="로그 스캔 범위 (최근 블록 수)")
+    parser.add_argument("--dex", action="store_true", help="DEX 유동성 풀 포함")
+    parser.add_argument("--no-hedge", action="store_true", help="RPC 헤지 요청 사용 안 함")
+    parser.add_argument("--workers", type=int, default=4, help="Explorer 동시 요청 수")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="파일", help="모든 HTTP/RPC 요청과 응답을 카세트 파일로 녹화")
+    cassette_group.add_argument("--replay", metavar="파일", help="네트워크 없이 카세트 파일의 녹화된 응답으로 실행")
+    parser.add_argument("--replay-latency", type=float, default=1.0,
+                        help="재생 지연 배율 (1=녹화 당시 지연 그대로, 0=지연 없음)")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        configure_cassette(args.record, "record")
+    elif args.replay:
+        configure_cassette(args.replay, "replay", args.replay_latency)
+
+    started = time.perf_counter()
+    hedge = not args.no_hedge
+
+    if args.cross_chain:
+        contracts = CROSS_CHAIN_PRESETS.get(args.cross_chain.upper()) or parse_chain_contracts(args.cross_chain.replace(",", "\n"))
+        if not contracts:
+            parser.error("--cross-chain: 알 수 없는 프리셋이거나 올바른 체인:주소가 없습니다")
+        cross_chain_data = asyncio.run(fetch_cross_chain_data(contracts, hedge=hedge, max_workers=args.workers))
+        _, exchange_df = build_cross_chain_tables(cross_chain_data)
+        result = {
+            "chains": {
+                chain: data if "error" in data else summarize_dashboard_data(chain, contracts[chain], data)
+                for chain, data in cross_chain_data.items()
+            },
+            "exchanges": exchange_df.to_dict(orient="records")
+        }
+    elif args.watchlist:
+        if args.chain not in get_chain_info():
+            parser.error("--watchlist에는 --chain이 필요합니다")
+        watchlist_data = fetch_watchlist(args.chain, args.watchlist, get_chain_info()[args.chain]["wallets"], hedge=hedge)
+        balances = watchlist_data["balances"].astype(object).where(watchlist_data["balances"].notna(), None)
+        result = {
+            "chain": args.chain,
+            "block": watchlist_data["block"],
+            "tokens": [dict(info, address=token) for info, token in zip(watchlist_data["token_info"], args.watchlist)],
+            "balances": balances.to_dict(orient="index")
+        }
+    else:
+        if args.chain not in get_chain_info() or not args.token:
+            parser.error("--chain과 --token이 필요합니다 (또는 --cross-chain / --watchlist)")
+        if args.withdrawals:
+            withdrawal_source = "Explorer API" if args.withdrawals == "explorer" else "RPC 로그 스캔"
+        else:
+            withdrawal_source = "Explorer API" if get_explorer_api_key(args.chain) else "RPC 로그 스캔"
+        data = asyncio.run(fetch_dashboard_data(
+            args.chain,
+            args.token,
+            get_chain_info()[args.chain]["wallets"],
+            include_dex=args.dex,
+            withdrawal_source=withdrawal_source,
+            lookback_blocks=args.lookback_blocks,
+            hedge=hedge,
+            max_workers=args.workers
+        ))
+        result = summarize_dashboard_data(args.chain, args.token, data)
+
+    result["startup"] = {
+        "import_seconds": round(IMPORT_SECONDS, 4),
+        "fetch_seconds": round(time.perf_counter() - started, 4)
+    }
+    if get_cassette():
+        result["startup"]["cassette"] = get_cassette().stats()
+
+    output = json.dumps(result, ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())